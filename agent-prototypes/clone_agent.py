@@ -39,7 +39,7 @@ class Agent:
         self.step = 0
 
         # DEBUG
-        self.debug_mode = True
+        self.debug_mode = False
         self.filename =  datetime.now().strftime('clone_agent/log/log_%H_%M_%d_%m_%Y.csv')
 
 
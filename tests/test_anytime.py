@@ -0,0 +1,114 @@
+"""
+The agent's anytime mode: deadline checks around the strategy cascade.
+"""
+import random
+import time
+
+import pytest
+from coderone.dungeon.game import Game
+
+from wizard_agent import my_agent
+from wizard_agent.brain.mcts_strategy import MctsStrategy
+from wizard_agent.brain.strategy import Strategy
+
+ACTIONS = my_agent.ACTIONS
+DEADLINE = 0.05
+
+
+class StubStrategy(Strategy):
+    """
+    Can execute when told to, taking the given time to find out on the first call only
+    """
+
+    def __init__(self, name, calls, can=False, delay=0.0, actions=None):
+        self.name = name
+        self.calls = calls
+        self.can = can
+        self.delay = delay
+        self.actions = actions or [ACTIONS["none"]]
+
+    def can_execute(self, game_state, player_state):
+        self.calls.append(self.name)
+        time.sleep(self.delay)
+        self.delay = 0.0
+        return self.can
+
+    def execute(self, game_state, player_state):
+        self.calls.append(self.name + '.execute')
+        return list(self.actions)
+
+
+class Match:
+    def __init__(self):
+        random.seed(0)
+        self.game = Game()
+        self.game.add_player('p0')
+        self.game.add_player('p1')
+        self.game.generate_map()
+        self.pid = next(iter(self.game.players))
+
+    def states(self, tick):
+        self.game.tick_counter = tick
+        return self.game._serialize_state(), self.game._player_state(self.pid, self.game.players[self.pid])
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.delenv('WIZARD_TICK_DEADLINE', raising=False)
+    monkeypatch.delenv('WIZARD_SEARCH', raising=False)
+    return my_agent.Agent(tick_deadline=DEADLINE)
+
+
+def stub_priority(agent, calls, **stubs):
+    for name in ['flee', 'trap', 'chainbomb', 'smartbomb', 'smartcollect', 'combo_kill', 'kill', 'retreat']:
+        agent.strategies[name] = StubStrategy(name, calls, **stubs.get(name, {}))
+
+
+def test_plans_first_strategy_that_can_execute(agent):
+    calls = []
+    stub_priority(agent, calls, trap={'can': True, 'actions': [ACTIONS["bomb"]]})
+    match = Match()
+    assert agent.next_move(*match.states(0)) == ACTIONS["bomb"]
+    assert calls == ['flee', 'trap', 'trap.execute']
+    assert agent.tier_counts['planned'] == 1
+
+
+def test_no_plan_past_the_deadline(agent):
+    calls = []
+    stub_priority(agent, calls, flee={'delay': DEADLINE + 0.01}, trap={'can': True})
+    match = Match()
+    fallback_action = agent.fallback_action
+    assert agent.next_move(*match.states(0)) == fallback_action
+    assert calls == ['flee']
+    assert agent.tier_counts['deadline'] == 1
+
+
+def test_strategy_found_at_the_deadline_is_planned_next_tick(agent):
+    calls = []
+    stub_priority(agent, calls, flee={'delay': 0.0},
+                  trap={'can': False},
+                  chainbomb={'can': True, 'delay': DEADLINE + 0.01, 'actions': [ACTIONS["bomb"]]})
+    match = Match()
+
+    # chainbomb can execute, but the deadline passed while it found out
+    agent.next_move(*match.states(0))
+    assert calls == ['flee', 'trap', 'chainbomb']
+    assert agent.tier_counts['deferred'] == 1
+    assert agent.tier_counts['deadline'] == 1
+
+    # tried right after flee on the next tick and planned
+    calls.clear()
+    assert agent.next_move(*match.states(1)) == ACTIONS["bomb"]
+    assert calls == ['flee', 'chainbomb', 'chainbomb.execute']
+    assert agent.tier_counts['planned'] == 1
+
+
+def test_search_stops_at_the_deadline():
+    match = Match()
+    strategy = MctsStrategy(time_budget=1.0)
+    strategy.set_deadline(time.perf_counter())
+    game_state, player_state = match.states(0)
+    start = time.perf_counter()
+    assert len(strategy.execute(game_state, player_state)) == 1
+    assert strategy.iterations == 1
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,84 @@
+"""
+BombTracker detonation ticks on hand-built maps.
+"""
+import random
+
+import pytest
+from coderone.dungeon.game import Game
+
+from wizard_agent.brain.utils import bomb_tracker, constants
+
+
+class Match:
+    """
+    An empty map with the players in opposite corners, fed to a tracker tick by tick
+    """
+
+    def __init__(self):
+        random.seed(0)
+        self.game = Game()
+        self.game.add_player('p0')
+        self.game.add_player('p1')
+        self.game.generate_map()
+        self.game.static_block_list = []
+        self.game.value_block_list = []
+        self.game.ammunition_list = []
+        self.game.treasure_list = []
+        players = list(self.game.players.values())
+        players[0].pos = (0, 0)
+        players[1].pos = (self.game.column_count - 1, self.game.row_count - 1)
+        self.pid = next(iter(self.game.players))
+        self.tracker = bomb_tracker.BombTracker()
+
+    def add_bomb(self, tile):
+        self.game.bomb_list.append(Game._Bomb(1, tile, Game.BOMB_TTL, constants.BLAST_POWER))
+
+    def update(self, tick):
+        self.game.tick_counter = tick
+        game_state = self.game._serialize_state()
+        self.tracker.update(game_state, self.game._player_state(self.pid, self.game.players[self.pid]))
+
+
+@pytest.fixture
+def match():
+    return Match()
+
+
+def test_bombs_go_off_on_their_own_timers(match):
+    match.add_bomb((2, 2))
+    match.update(0)
+    match.add_bomb((2, 7))
+    match.update(10)
+    assert match.tracker.detonation_ticks == {(2, 2): constants.BOMB_DURATION, (2, 7): 10 + constants.BOMB_DURATION}
+
+
+def test_blast_sets_off_bomb_in_range(match):
+    match.add_bomb((2, 2))
+    match.update(0)
+    match.add_bomb((4, 2))
+    match.update(10)
+    assert match.tracker.detonation_ticks[(4, 2)] == constants.BOMB_DURATION + 1
+    assert match.tracker.triggers == {(4, 2): (2, 2)}
+
+
+def test_chain_link_opens_when_block_breaks(match):
+    match.game.value_block_list = [Game._SoftBlock((3, 2), 1)]
+    match.add_bomb((2, 2))
+    match.update(0)
+    match.add_bomb((4, 2))
+    match.update(10)
+    assert match.tracker.detonation_ticks[(4, 2)] == 10 + constants.BOMB_DURATION
+
+    # no bomb appeared or vanished, but the block between them is gone
+    match.game.value_block_list = []
+    match.update(11)
+    assert match.tracker.changed
+    assert (4, 2) in match.tracker.blast_tiles[(2, 2)]
+    assert match.tracker.detonation_ticks[(4, 2)] == constants.BOMB_DURATION + 1
+
+
+def test_nothing_changed(match):
+    match.add_bomb((2, 2))
+    match.update(0)
+    match.update(1)
+    assert not match.tracker.changed
@@ -0,0 +1,61 @@
+"""
+ChainBombStrategy on a hand-built map.
+
+    y=3  . . . . s .
+    y=2  . . B . * O     B: our bomb, where we stand   *: the placement
+    y=1  . . . . s .     s: soft block                 O: ore block
+"""
+import random
+
+import pytest
+from coderone.dungeon.game import Game
+
+from wizard_agent.brain.chain_bomb_strategy import ChainBombStrategy
+from wizard_agent.brain.utils import constants, util_functions as utils
+
+LOCATION = (2, 2)
+PLACEMENT = (4, 2)
+
+
+def states(bomb=True, ammo=3):
+    random.seed(0)
+    game = Game()
+    game.add_player('p0')
+    game.add_player('p1')
+    game.generate_map()
+    game.static_block_list = []
+    game.ammunition_list = []
+    game.treasure_list = []
+    game.value_block_list = [Game._SoftBlock((4, 3), 1), Game._SoftBlock((4, 1), 1),
+                             Game._OreBlock((5, 2), Game.ORE_BLOCK_HP)]
+    pid, other = list(game.players)
+    game.players[pid].pos = LOCATION
+    game.players[pid].ammo = ammo
+    game.players[other].pos = (game.column_count - 1, game.row_count - 1)
+    if bomb:
+        game.bomb_list.append(Game._Bomb(pid, LOCATION, Game.BOMB_TTL, Game.PLAYER_START_POWER))
+    return game._serialize_state(), game._player_state(pid, game.players[pid])
+
+
+def test_joins_the_bomb_underfoot():
+    game_state, player_state = states()
+    strategy = ChainBombStrategy()
+    assert strategy.can_execute(game_state, player_state)
+    tile, value, escape_path = strategy.get_best_placement(strategy.world)
+    assert tile == PLACEMENT
+    assert value > 5
+    assert strategy.evaluations >= 1
+
+    actions = strategy.execute(game_state, player_state)
+    assert actions[:3] == [constants.ACTIONS["right"], constants.ACTIONS["right"], constants.ACTIONS["bomb"]]
+    assert actions[3:] == utils.get_path_action_seq(PLACEMENT, escape_path)
+    # the escape leaves both blasts
+    blasts = set(utils.get_blast_zone(PLACEMENT, game_state, 2)) | set(utils.get_blast_zone(LOCATION, game_state, 2))
+    assert escape_path and escape_path[-1] not in blasts
+
+
+@pytest.mark.parametrize('bomb, ammo', [(False, 3), (True, 0)])
+def test_nothing_to_join_or_no_ammo(bomb, ammo):
+    game_state, player_state = states(bomb, ammo)
+    strategy = ChainBombStrategy()
+    assert not strategy.can_execute(game_state, player_state)
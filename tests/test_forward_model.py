@@ -0,0 +1,18 @@
+"""
+Conformance of the forward model with the engine, tick by tick, on recorded seeded matches.
+"""
+import pytest
+
+import forward_model_check
+
+# even seeds play flee_bot, odd ones self-play
+SEEDS = [0, 1, 4, 5]
+RESPAWN_SEED = 0
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_model_matches_engine(seed, tmp_path):
+    filename = forward_model_check.record_match(seed, str(tmp_path))
+    ticks, mismatches = forward_model_check.check_recording(filename, RESPAWN_SEED)
+    assert ticks > 100
+    assert mismatches == {'step': [], 'rollout': []}
@@ -0,0 +1,166 @@
+"""
+get_shortest_path against the list-based A* it replaced, on seeded random maps.
+
+The old search scored nodes by their Manhattan distance from the start rather than the
+travelled cost, so its paths can be longer than the shortest. The new one must reach exactly
+the same targets, never return a longer path and always return a shortest one.
+"""
+import random
+from collections import deque
+
+import pytest
+from coderone.dungeon.game import Game
+
+from wizard_agent.brain.utils import util_functions as utils
+from wizard_agent.brain.utils.structures import Node
+
+MAP_COUNT = 300
+QUERIES_PER_MAP = 4
+
+
+# The A* as it was before the heap-based rewrite
+
+def baseline_shortest_path(start, end, game_state, blast_tiles=[]):
+    if start is None or end is None:
+        return None
+    queue = []
+    visited = []
+    start_node = Node(start, None)
+    goal_node = Node(end, None)
+    queue.append(start_node)
+    while len(queue) > 0:
+        queue.sort()
+        current_node = queue.pop(0)
+        visited.append(current_node)
+        if current_node == goal_node:
+            path = []
+            while current_node != start_node:
+                path.append(current_node.position)
+                current_node = current_node.parent
+            return path[::-1]
+        for tile in utils.get_surrounding_tiles(current_node.position, game_state):
+            if tile in blast_tiles:
+                continue
+            if not utils.is_walkable(tile, game_state):
+                continue
+            neighbour = Node(tile, current_node)
+            if neighbour in visited:
+                continue
+            neighbour.dist_to_start = utils.manhattan_distance(neighbour.position, start_node.position)
+            neighbour.dist_to_goal = utils.manhattan_distance(neighbour.position, goal_node.position)
+            neighbour.total_cost = neighbour.dist_to_start + neighbour.dist_to_goal
+            if baseline_can_enqueue(queue, neighbour):
+                queue.append(neighbour)
+    return None
+
+
+def baseline_can_enqueue(queue, neighbour):
+    for node in queue:
+        if neighbour == node and neighbour.total_cost >= node.total_cost:
+            return False
+    return True
+
+
+# Helpers
+
+def random_state(rng):
+    """
+    Returns a generated map with a random share of its blocks knocked out and a few bombs
+    """
+    random.seed(rng.randrange(2 ** 32))
+    game = Game()
+    game.add_player('p0')
+    game.add_player('p1')
+    game.generate_map()
+    keep = rng.random()
+    game.value_block_list = [block for block in game.value_block_list if rng.random() < keep]
+    state = game._serialize_state()
+    free = [(x, y) for x in range(game.column_count) for y in range(game.row_count) if not state.is_occupied((x, y))]
+    for bomb in rng.sample(free, rng.randint(0, 4)):
+        game.bomb_list.append(Game._Bomb(1, bomb, Game.BOMB_TTL, Game.PLAYER_START_POWER))
+    return game._serialize_state()
+
+
+def random_blast_tiles(rng, game_state):
+    width, height = game_state.size
+    count = rng.choice([0, 0, 3, 10, 25])
+    return [(rng.randrange(width), rng.randrange(height)) for _ in range(count)]
+
+
+def bfs_distance(start, end, game_state, blast_tiles):
+    """
+    Number of steps of the shortest path, or None if there is none
+    """
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        tile = queue.popleft()
+        if tile == end:
+            return distances[tile]
+        for neighbour in utils.get_surrounding_tiles(tile, game_state):
+            if neighbour in distances or neighbour in blast_tiles or not utils.is_walkable(neighbour, game_state):
+                continue
+            distances[neighbour] = distances[tile] + 1
+            queue.append(neighbour)
+    return None
+
+
+def assert_valid_path(path, start, end, game_state, blast_tiles):
+    previous = start
+    for tile in path:
+        assert utils.manhattan_distance(previous, tile) == 1
+        assert utils.is_walkable(tile, game_state)
+        assert tile not in blast_tiles
+        previous = tile
+    assert previous == end
+
+
+def queries(rng, game_state):
+    """
+    Yields (start, end) pairs: a random pair, a walkable start and a random target (often
+    blocked or walled in, so unreachable) and start == target
+    """
+    width, height = game_state.size
+    tiles = [(x, y) for x in range(width) for y in range(height)]
+    walkable = [tile for tile in tiles if utils.is_walkable(tile, game_state)]
+    for _ in range(QUERIES_PER_MAP - 2):
+        yield rng.choice(walkable), rng.choice(walkable)
+    yield rng.choice(walkable), rng.choice(tiles)
+    tile = rng.choice(walkable)
+    yield tile, tile
+
+
+# Tests
+
+def test_matches_baseline_on_random_maps():
+    rng = random.Random(1234)
+    reachable = unreachable = 0
+    for _ in range(MAP_COUNT):
+        game_state = random_state(rng)
+        for start, end in queries(rng, game_state):
+            blast_tiles = random_blast_tiles(rng, game_state)
+            expected = baseline_shortest_path(start, end, game_state, blast_tiles)
+            path = utils.get_shortest_path(start, end, game_state, blast_tiles)
+            assert (path is None) == (expected is None), (start, end, blast_tiles)
+            if path is None:
+                unreachable += 1
+                continue
+            reachable += 1
+            assert_valid_path(path, start, end, game_state, blast_tiles)
+            assert len(path) <= len(expected)
+            assert len(path) == bfs_distance(start, end, game_state, blast_tiles)
+    # both kinds of target were exercised
+    assert reachable > MAP_COUNT and unreachable > MAP_COUNT // 10
+
+
+def test_start_is_target():
+    game_state = random_state(random.Random(7))
+    width, height = game_state.size
+    tile = next((x, y) for x in range(width) for y in range(height) if utils.is_walkable((x, y), game_state))
+    assert utils.get_shortest_path(tile, tile, game_state) == baseline_shortest_path(tile, tile, game_state) == []
+
+
+@pytest.mark.parametrize('start, end', [(None, (0, 0)), ((0, 0), None), ((-1, 0), (0, 0)), ((0, 0), (12, 0))])
+def test_no_path_off_the_map(start, end):
+    game_state = random_state(random.Random(7))
+    assert utils.get_shortest_path(start, end, game_state) is None
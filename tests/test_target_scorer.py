@@ -0,0 +1,48 @@
+"""
+TargetScorer ranking on a generated map cleared of blocks.
+"""
+import random
+
+from coderone.dungeon.game import Game
+
+from wizard_agent.brain.utils import target_scorer
+
+
+class RaceMap:
+    def __init__(self, lost=()):
+        self.lost = set(lost)
+
+    def is_opponent_closer(self, tile):
+        return tile in self.lost
+
+
+def game_state():
+    random.seed(0)
+    game = Game()
+    game.add_player('p0')
+    game.add_player('p1')
+    game.generate_map()
+    game.value_block_list = []
+    game.static_block_list = []
+    return game._serialize_state(), game.players[next(iter(game.players))].pos
+
+
+def test_ranked_by_score_then_listing_order():
+    state, location = game_state()
+    a, b, c = [tile for tile in [(0, 0), (5, 5), (9, 9), (3, 7)] if tile != location][:3]
+    scorer = target_scorer.TargetScorer(location, [a, b, c, c], state)
+    assert scorer.ranked() == [c, a, b]  # c is listed twice
+    scorer.add_membership([b], 5)
+    assert scorer.ranked() == [b, c, a]
+
+
+def test_best_skips_lost_races_and_our_own_tile():
+    state, location = game_state()
+    a, b = [tile for tile in [(0, 0), (5, 5), (9, 9)] if tile != location][:2]
+    scorer = target_scorer.TargetScorer(location, [location, a, b], state)
+    scorer.add_membership([location], 10)
+    scorer.add_membership([a], 5)
+    assert scorer.ranked()[:2] == [location, a]
+    assert scorer.best(RaceMap()) == a
+    assert scorer.best(RaceMap([a])) == b
+    assert scorer.best(RaceMap([a, b])) is None
@@ -0,0 +1,134 @@
+"""
+Plays batches of seeded headless matches between the wizard agent and the prototype bots.
+
+Matches are driven in-process by sync_driver, as fast as the agents answer and without
+sleeping between ticks, and are spread over a process pool. Usage, from the repository root:
+
+    python tools/batch_runner.py --games 200 --workers 8
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import sync_driver
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT = os.path.join(REPO_ROOT, 'wizard_agent')
+# treasure_bot.py needs the pathfinding package, which the agent doesn't depend on. It can
+# still be passed on the command line where it is installed
+OPPONENTS = [
+    os.path.join(REPO_ROOT, 'agent-prototypes', 'flee_bot.py'),
+    os.path.join(REPO_ROOT, 'agent-prototypes', 'clone_agent.py'),
+]
+# prototypes written as a module of an agent package, importing its brain relatively
+PACKAGES = {
+    'clone_agent.py': AGENT,
+}
+
+MAX_ITERATIONS = sync_driver.MAX_ITERATIONS
+
+
+def play_match(agent_path, opponent_path, seed, max_iterations=MAX_ITERATIONS):
+    """
+    Plays a single match with the agent as player 0 and returns its result
+    """
+    drivers = [sync_driver.Driver(agent_path), driver(opponent_path)]
+    stats, (agent, _) = sync_driver.play_match(drivers, seed, ['agent', 'opponent'], max_iterations)
+    return {
+        'opponent': os.path.basename(opponent_path),
+        'seed': seed,
+        'won': stats.winner_pid == 0,
+        'ticks': stats.iteration,
+        'score': stats.players[0].score,
+        'opponent_score': stats.players[1].score,
+        'hp': stats.players[0].hp,
+        'latencies': agent.latencies,
+    }
+
+
+def summarise(results):
+    """
+    Aggregates match results into win rate, score and per-tick latency per opponent
+    """
+    summary = {}
+    for opponent in sorted({result['opponent'] for result in results}):
+        matches = [result for result in results if result['opponent'] == opponent]
+        latencies = sorted(latency for match in matches for latency in match['latencies'])
+        summary[opponent] = {
+            'games': len(matches),
+            'win_rate': sum(match['won'] for match in matches) / len(matches),
+            'mean_score': statistics.mean(match['score'] for match in matches),
+            'mean_opponent_score': statistics.mean(match['opponent_score'] for match in matches),
+            'mean_ticks': statistics.mean(match['ticks'] for match in matches),
+            'latency_mean_ms': 1000 * statistics.mean(latencies) if latencies else 0,
+            'latency_p99_ms': 1000 * latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0,
+            'latency_max_ms': 1000 * latencies[-1] if latencies else 0,
+        }
+    return summary
+
+
+def driver(path):
+    return sync_driver.Driver(path, package=PACKAGES.get(os.path.basename(path)))
+
+
+def load_error(path):
+    """
+    Returns why the agent at the path can't be imported, or None if it can
+    """
+    try:
+        driver(path).agent()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def run_batch(agent_path, opponent_paths, games, workers=None, first_seed=0, max_iterations=MAX_ITERATIONS):
+    """
+    Plays the given number of seeded matches against every opponent across a process pool
+    """
+    jobs = [(opponent, seed) for opponent in opponent_paths for seed in range(first_seed, first_seed + games)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_match, agent_path, opponent, seed, max_iterations) for opponent, seed in jobs]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play batches of headless matches against the prototype bots')
+    parser.add_argument('--games', type=int, default=20, help='matches per opponent')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, defaults to the cpu count')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first match')
+    parser.add_argument('--max_iterations', type=int, default=MAX_ITERATIONS)
+    parser.add_argument('--agent', type=str, default=AGENT, help='agent module to evaluate')
+    parser.add_argument('opponents', nargs='*', default=OPPONENTS, help='opponent modules')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    skipped = {}
+    for path in args.opponents:
+        error = load_error(path)
+        if error is not None:
+            logger.error(f"skipping {os.path.basename(path)}: {error}")
+            skipped[os.path.basename(path)] = error
+    opponents = [path for path in args.opponents if os.path.basename(path) not in skipped]
+
+    start = time.time()
+    results = run_batch(args.agent, opponents, args.games, args.workers, args.seed, args.max_iterations)
+    elapsed = time.time() - start
+
+    for opponent, row in summarise(results).items():
+        print(f"{opponent}: {row['games']} games, win rate {row['win_rate']:.1%}, "
+              f"score {row['mean_score']:.1f} vs {row['mean_opponent_score']:.1f}, "
+              f"{row['mean_ticks']:.0f} ticks, latency mean {row['latency_mean_ms']:.2f}ms "
+              f"p99 {row['latency_p99_ms']:.2f}ms max {row['latency_max_ms']:.2f}ms")
+    for opponent, error in skipped.items():
+        print(f"{opponent}: skipped, {error}")
+    print(f"{len(results)} games in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
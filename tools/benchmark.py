@@ -0,0 +1,317 @@
+"""
+Benchmarks of the brain/utils hot paths, the strategies and a full agent decision.
+
+Every call is timed cold: the per-state caches of util_functions are reset and each strategy
+gets a fresh world model, so the numbers are what a tick pays the first time it asks. Fixtures
+are seeded game states at several densities:
+
+    early   freshly generated maps, full of blocks
+    late    self-play recordings checked in under tools/fixtures, replayed to LATE_TICK, most
+            blocks gone. Recorded once so later changes to the agent don't move the positions
+    bombs   fresh maps with a dozen bombs ticking
+    chain   fresh maps with a bomb just placed where player 0 stands, which a second bomb
+            nearby can join in a chain
+
+Usage, from the repository root:
+
+    python tools/benchmark.py                     # compare against tools/benchmark_baseline.json
+    python tools/benchmark.py --save              # record a new baseline
+    python tools/benchmark.py --record-fixtures   # record the late fixtures again, then --save
+
+Timings only compare between runs on the same machine, so record the baseline where it is
+compared. Per-call times of well under a millisecond are noisy on a busy machine, hence the
+loose default tolerance.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from coderone.dungeon.game import Game
+from coderone.dungeon.game_recorder import FileRecorder
+
+import replay
+import sync_driver
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import wizard_agent  # noqa: E402
+from wizard_agent import my_agent  # noqa: E402
+
+utils = wizard_agent.my_agent.brain.utils
+util_functions = utils.util_functions
+
+BASELINE = os.path.join(REPO_ROOT, 'tools', 'benchmark_baseline.json')
+FIXTURE_DIR = os.path.join(REPO_ROOT, 'tools', 'fixtures')
+SEEDS = [0, 1, 2]
+LATE_TICK = 600
+BOMB_COUNT = 12
+REGRESSION_RATIO = 1.5  # slower than the baseline median by more than this is reported
+NOISE_FLOOR_MS = 0.05  # unless it is slower by less than this
+
+
+# Fixtures
+
+def new_game(seed):
+    random.seed(seed)
+    game = Game(max_iterations=sync_driver.MAX_ITERATIONS)
+    game.add_player('p0')
+    game.add_player('p1')
+    game.generate_map()
+    return game
+
+
+def early_fixture(seed):
+    return new_game(seed)
+
+
+def late_recording(seed):
+    return os.path.join(FIXTURE_DIR, f'late_{seed}.rec')
+
+
+def record_late_fixtures():
+    """
+    Records seeded self-play of the current agent up to LATE_TICK, one recording per seed
+    """
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    driver = sync_driver.Driver(os.path.join(REPO_ROOT, 'wizard_agent'))
+    for seed in SEEDS:
+        with FileRecorder(late_recording(seed)) as recorder:
+            sync_driver.play_match([driver, driver], seed, ['p0', 'p1'], LATE_TICK, recorder=recorder)
+
+
+def late_fixture(seed):
+    """
+    Replays the recorded self-play of the seed up to LATE_TICK and returns the game at that point
+    """
+    game = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game, observers, moves in replay.recorded_ticks(late_recording(seed), seed=seed):
+            if game.tick_counter >= LATE_TICK:
+                break
+            replay.step(game, moves, observers)
+    return game
+
+
+def bombs_fixture(seed):
+    game = new_game(seed)
+    state = game._serialize_state()
+    free = [(x, y) for x in range(game.column_count) for y in range(game.row_count) if not state.is_occupied((x, y))]
+    for bomb in random.sample(free, min(BOMB_COUNT, len(free))):
+        game.bomb_list.append(Game._Bomb(1, bomb, random.randint(1, Game.BOMB_TTL), Game.PLAYER_START_POWER))
+    return game
+
+
+def chain_fixture(seed):
+    game = new_game(seed)
+    pid = next(iter(game.players))
+    game.bomb_list.append(Game._Bomb(pid, game.players[pid].pos, Game.BOMB_TTL, Game.PLAYER_START_POWER))
+    return game
+
+
+FIXTURES = {
+    'early': early_fixture,
+    'late': late_fixture,
+    'bombs': bombs_fixture,
+    'chain': chain_fixture,
+}
+
+
+def load_fixtures():
+    """
+    Returns {density: [(game_state, player_state)]} seen by player 0
+    """
+    fixtures = {}
+    for density, make in FIXTURES.items():
+        fixtures[density] = []
+        for seed in SEEDS:
+            game = make(seed)
+            pid = next(iter(game.players))
+            fixtures[density].append((game._serialize_state(), game._player_state(pid, game.players[pid])))
+    return fixtures
+
+
+# Benchmarks
+
+def reset_caches():
+    util_functions._grid_view_cache = (None, None)
+    util_functions._distance_field_cache = (None, {})
+
+
+def farthest_tile(game_state, location):
+    field = util_functions.get_distance_field(location, game_state)
+    width, height = game_state.size
+    tiles = [(x, y) for x in range(width) for y in range(height) if field.reachable((x, y))]
+    return max(tiles, key=lambda tile: field.dist(tile), default=location)
+
+
+def util_benchmarks(game_state, player_state):
+    location = player_state.location
+    target = farthest_tile(game_state, location)
+    near_blocks = util_functions.get_empty_locations(game_state.soft_blocks + game_state.ore_blocks, game_state)
+    return {
+        'get_shortest_path': lambda: util_functions.get_shortest_path(location, target, game_state),
+        'get_reachable_tiles': lambda: util_functions.get_reachable_tiles(location, near_blocks, game_state),
+        'safe_escape': lambda: util_functions.safe_escape(location, game_state),
+        'get_escape_matrix': lambda: util_functions.get_escape_matrix(game_state),
+    }
+
+
+def strategy_benchmarks(game_state, player_state):
+    benchmarks = {}
+    for name in my_agent.Agent().strategies:
+        for method in ('can_execute', 'execute'):
+            benchmarks[f'{name}.{method}'] = strategy_call(name, method, game_state, player_state)
+    return benchmarks
+
+
+def strategy_call(name, method, game_state, player_state):
+    """
+    Returns a (setup, call) pair. As in the agent, execute only runs after can_execute
+    returned true, which isn't timed, and is skipped on fixtures where it didn't
+    """
+    def setup():
+        agent = my_agent.Agent()
+        agent.world.update(game_state, player_state)
+        strategy = agent.strategies[name]
+        if method == 'execute' and not strategy.can_execute(game_state, player_state):
+            return None
+        return getattr(strategy, method)
+
+    return setup, lambda call: call(game_state, player_state)
+
+
+def agent_benchmarks(game_state, player_state):
+    return {'Agent.next_move': (my_agent.Agent, lambda agent: agent.next_move(game_state, player_state))}
+
+
+def time_calls(benchmark, repeat):
+    """
+    Times repeat cold calls of a benchmark, either a callable or a (setup, call) pair whose
+    setup isn't timed. A setup returning None skips the call. Returns the timings in ms and
+    the number of calls that raised
+    """
+    setup, call = benchmark if isinstance(benchmark, tuple) else (None, None)
+    timings = []
+    errors = 0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # as timeit does, so a collection doesn't land on a random call
+    for _ in range(repeat):
+        reset_caches()
+        if setup:
+            argument = setup()
+            if argument is None:
+                continue
+            start = time.perf_counter()
+            try:
+                call(argument)
+            except Exception:
+                errors += 1
+                continue
+        else:
+            start = time.perf_counter()
+            try:
+                benchmark()
+            except Exception:
+                errors += 1
+                continue
+        timings.append(1000 * (time.perf_counter() - start))
+    if gc_was_enabled:
+        gc.enable()
+    return timings, errors
+
+
+def run(fixtures, repeat):
+    """
+    Returns {benchmark name: {density: {median_ms, p99_ms, errors}}}
+    """
+    results = {}
+    for density, states in fixtures.items():
+        samples = {}
+        errors = {}
+        for game_state, player_state in states:
+            reset_caches()
+            benchmarks = {}
+            for group in (util_benchmarks, strategy_benchmarks, agent_benchmarks):
+                benchmarks.update(group(game_state, player_state))
+            for name, benchmark in benchmarks.items():
+                timings, failed = time_calls(benchmark, repeat)
+                samples.setdefault(name, []).extend(timings)
+                errors[name] = errors.get(name, 0) + failed
+        for name, timings in samples.items():
+            timings.sort()
+            results.setdefault(name, {})[density] = {
+                'median_ms': statistics.median(timings) if timings else None,
+                'p99_ms': timings[int(0.99 * (len(timings) - 1))] if timings else None,
+                'errors': errors[name],
+            }
+    return results
+
+
+def report(results, baseline, tolerance=REGRESSION_RATIO):
+    """
+    Prints the results next to the baseline and returns the (name, density) pairs that regressed
+    """
+    regressions = []
+    print(f"{'benchmark':32} {'fixture':8} {'median':>9} {'p99':>9} {'baseline':>9} {'ratio':>6}")
+    for name, densities in results.items():
+        for density, row in densities.items():
+            if row['median_ms'] is None:
+                print(f"{name:32} {density:8} {'failed' if row['errors'] else 'skipped':>9}")
+                continue
+            base = baseline.get(name, {}).get(density, {}).get('median_ms')
+            ratio = row['median_ms'] / base if base else None
+            flag = ''
+            if ratio is not None and ratio > tolerance and row['median_ms'] - base > NOISE_FLOOR_MS:
+                regressions.append((name, density))
+                flag = ' <- slower'
+            if row['errors']:
+                flag += f" ({row['errors']} errors)"
+            print(f"{name:32} {density:8} {row['median_ms']:8.3f}ms {row['p99_ms']:8.3f}ms "
+                  f"{(f'{base:.3f}ms') if base else '-':>9} {(f'{ratio:.2f}') if ratio else '-':>6}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the agent hot paths')
+    parser.add_argument('--repeat', type=int, default=20, help='cold calls per benchmark and fixture')
+    parser.add_argument('--baseline', type=str, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_RATIO,
+                        help='median ratio to the baseline above which a benchmark counts as slower')
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--record-fixtures', action='store_true',
+                        help='record the late fixtures again with the current agent, and exit')
+    args = parser.parse_args()
+
+    if args.record_fixtures:
+        record_late_fixtures()
+        print(f"late fixtures written to {FIXTURE_DIR}, save a new baseline to compare against them")
+        return
+
+    results = run(load_fixtures(), args.repeat)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = report(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmarks slower than {args.tolerance}x their baseline")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Conformance check of the agent's forward model against the engine, over recorded matches.
+
+Every tick of a recording is played twice: by the engine, through the replay, and by the
+forward model with the same moves in the same order. Two models are checked against the
+engine after every tick:
+
+    step     rebuilt from the engine before the tick, so each tick is checked on its own
+    rollout  built once and stepped through the whole match, with the engine's ammo and
+             treasure respawns copied in since the model doesn't spawn them
+
+Their blocks and hit points, bomb timers, fire, players (position, hp, ammo, power, reward),
+ammo and treasure must all match. Without recordings, seeded matches are played and recorded
+first. The copy and step times of the model are reported too. Usage, from the repository root:
+
+    python tools/forward_model_check.py --games 5
+    python tools/forward_model_check.py match.rec other.rec
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+from coderone.dungeon.game import Game
+from coderone.dungeon.game_recorder import FileRecorder
+
+import replay
+import sync_driver
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from wizard_agent.brain.utils import forward_model  # noqa: E402
+
+AGENT = os.path.join(REPO_ROOT, 'wizard_agent')
+OPPONENTS = [os.path.join(REPO_ROOT, 'agent-prototypes', 'flee_bot.py'), AGENT]
+TIMING_TICK = 300
+BLOCK_KINDS = {
+    Game._IndestructibleBlock.Tag: forward_model.STATIC,
+    Game._SoftBlock.Tag: forward_model.SOFT,
+    Game._OreBlock.Tag: forward_model.ORE,
+}
+
+
+def from_game(game):
+    """
+    Returns the forward model of the engine's exact state
+    """
+    model = forward_model.ForwardModel(game.column_count, game.row_count, game.tick_counter)
+    for block in game.static_block_list:
+        model.add_block(block.pos, forward_model.STATIC)
+    for block in game.value_block_list:
+        model.add_block(block.pos, BLOCK_KINDS[block.Tag], block.hp)
+    for bomb in game.bomb_list:
+        model.add_bomb(bomb.pos, bomb.hp, bomb.power, bomb.owner_id)
+    for fire in game.fire_list:
+        model.add_fire(fire.pos, fire.owner_id)
+    for ammo in game.ammunition_list:
+        model.add_ammo(ammo.pos, ammo.hp)
+    for treasure in game.treasure_list:
+        model.add_treasure(treasure.pos)
+    for pid in sorted(game.players):
+        player = game.players[pid]
+        model.add_player(player.pos, player.hp, player.ammo, player.power, player.reward)
+    return model
+
+
+def engine_snapshot(game):
+    return {
+        'blocks': sorted([(block.pos, forward_model.STATIC, 0) for block in game.static_block_list] +
+                         [(block.pos, BLOCK_KINDS[block.Tag], block.hp) for block in game.value_block_list]),
+        'bombs': sorted((bomb.pos, bomb.hp, bomb.power, bomb.owner_id) for bomb in game.bomb_list),
+        'fire': sorted((fire.pos, fire.owner_id) for fire in game.fire_list),
+        'players': [(player.pos, player.hp, player.ammo, player.power, player.reward)
+                    for _, player in sorted(game.players.items())],
+        'ammo': sorted((ammo.pos, ammo.hp) for ammo in game.ammunition_list),
+        'treasure': sorted(treasure.pos for treasure in game.treasure_list),
+    }
+
+
+def model_snapshot(model):
+    tile = model.tile
+    return {
+        'blocks': sorted((tile(idx), kind, model.block_hp[idx] if kind != forward_model.STATIC else 0)
+                         for idx, kind in enumerate(model.block) if kind != forward_model.EMPTY),
+        'bombs': sorted((tile(idx), ticks_to_live, power, owner)
+                        for idx, (ticks_to_live, power, owner) in model.bombs.items()),
+        'fire': sorted((tile(idx), owner) for idx, owner in model.fire),
+        'players': [(tile(pos), hp, ammo, power, reward) for pos, hp, ammo, power, reward in
+                    zip(model.player_pos, model.player_hp, model.player_ammo, model.player_power,
+                        model.player_reward)],
+        'ammo': sorted((tile(idx), ticks_to_live) for idx, ticks_to_live in model.ammo.items()),
+        'treasure': sorted(tile(idx) for idx in model.treasure),
+    }
+
+
+def differences(expected, actual):
+    return {key: (expected[key], actual[key]) for key in expected if expected[key] != actual[key]}
+
+
+def copy_spawns(game, model, before):
+    """
+    Adds to the model the ammo and treasure the engine spawned during the last tick
+    """
+    for ammo in game.ammunition_list:
+        if ammo.pos not in before['ammo']:
+            model.add_ammo(ammo.pos, ammo.hp)
+    for treasure in game.treasure_list:
+        if treasure.pos not in before['treasure']:
+            model.add_treasure(treasure.pos)
+
+
+def check_recording(filename, seed):
+    """
+    Returns the number of ticks checked and the first mismatches of each model, as
+    (tick, differences) pairs
+    """
+    ticks = 0
+    mismatches = {'step': [], 'rollout': []}
+    rollout = None
+    for game, observers, moves in replay.recorded_ticks(filename, seed=seed):
+        if rollout is None:
+            rollout = from_game(game)
+        model = from_game(game)
+        before = {'ammo': {ammo.pos for ammo in game.ammunition_list},
+                  'treasure': {treasure.pos for treasure in game.treasure_list}}
+        actions = {move.pid: move.action.value for move in moves}
+        tick = game.tick_counter
+
+        replay.step(game, moves, observers)
+        model.step(actions)
+        rollout.step(actions)
+        copy_spawns(game, model, before)
+        copy_spawns(game, rollout, before)
+        ticks += 1
+
+        expected = engine_snapshot(game)
+        for name, checked in (('step', model), ('rollout', rollout)):
+            diff = differences(expected, model_snapshot(checked))
+            if diff:
+                mismatches[name].append((tick, diff))
+        if mismatches['rollout'] and mismatches['rollout'][-1][0] == tick:
+            rollout = from_game(game)  # start over, so one mismatch isn't reported on every tick
+    return ticks, mismatches
+
+
+def record_match(seed, directory):
+    """
+    Plays and records a seeded match of the agent, against flee_bot on even seeds and itself
+    on odd ones, returning the file name
+    """
+    drivers = [sync_driver.Driver(AGENT), sync_driver.Driver(OPPONENTS[seed % len(OPPONENTS)])]
+    filename = os.path.join(directory, f'match_{seed}.rec')
+    with FileRecorder(filename) as recorder:
+        sync_driver.play_match(drivers, seed, recorder=recorder)
+    return filename
+
+
+def record_matches(games, directory):
+    """
+    Plays and records the matches of the first seeds, returning the file names
+    """
+    return [record_match(seed, directory) for seed in range(games)]
+
+
+def time_model(filename, seed, tick=TIMING_TICK):
+    """
+    Returns the mean copy and step times in microseconds, on the state of a recording at the tick
+    (or its last one)
+    """
+    model = None
+    for game, observers, moves in replay.recorded_ticks(filename, seed=seed):
+        model = from_game(game)
+        if game.tick_counter >= tick:
+            break
+        replay.step(game, moves, observers)
+
+    actions = {pid: '' for pid in range(len(model.player_pos))}
+    number = 10000
+    copy_us = 1e6 * timeit.timeit(model.copy, number=number) / number
+    step_us = 1e6 * timeit.timeit(lambda: model.copy().step(actions), number=number) / number - copy_us
+    return copy_us, step_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the forward model against the engine')
+    parser.add_argument('recordings', nargs='*', help='files written by FileRecorder')
+    parser.add_argument('--games', type=int, default=5, help='matches to record when no recordings are given')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the replayed ammo and treasure respawns')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        recordings = args.recordings or record_matches(args.games, directory)
+        failed = False
+        for filename in recordings:
+            ticks, mismatches = check_recording(filename, args.seed)
+            print(f"{os.path.basename(filename)}: {ticks} ticks, "
+                  f"{len(mismatches['step'])} step and {len(mismatches['rollout'])} rollout mismatches")
+            for name, found in mismatches.items():
+                if found:
+                    failed = True
+                    tick, diff = found[0]
+                    print(f"  first {name} mismatch on tick {tick}:")
+                    for key, (expected, actual) in diff.items():
+                        print(f"    {key}: engine {expected}, model {actual}")
+        copy_us, step_us = time_model(recordings[0], args.seed)
+    print(f"copy {copy_us:.1f}us, step {step_us:.1f}us")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
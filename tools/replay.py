@@ -0,0 +1,190 @@
+"""
+Streaming replay of match recordings written by the engine's FileRecorder.
+
+A recording holds the players, the generated map and every move the engine applied, one
+`tick: event` line each. The replay rebuilds the map in a fresh Game and applies the recorded
+moves tick by tick, collecting the states the engine sends its agents. Lines are read lazily
+and only the moves of the current tick are held, so a recording of any length replays in
+constant memory.
+
+The engine doesn't record where ammo and treasure respawn, so a replay matches the match
+exactly until the first respawn (around tick 70). From then on the respawned pickups, and the
+ammo, bombs and rewards that follow from them, drift apart while the recorded moves still
+replay as they were made. Usage, from the repository root:
+
+    python tools/sync_driver.py wizard_agent agent-prototypes/flee_bot.py --seed 3 --record match.rec
+    python tools/replay.py match.rec --agent wizard_agent --player 0
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import jsonplus
+from coderone.dungeon.game import DelayedEffectType, Game, GameSysAction, GameSysActions, PlayerActions, PlayerMove
+
+import sync_driver
+
+
+class Observer:
+    """
+    Agent that never moves and keeps the last state it was sent
+    """
+
+    def __init__(self):
+        self.game_state = None
+        self.player_state = None
+
+    def update(self, game_state, player_state):
+        self.game_state = game_state
+        self.player_state = player_state
+
+    def next_move(self):
+        return None
+
+
+def read_events(filename):
+    """
+    Yields the (tick, event) pairs of a recording, events being GameSysAction or PlayerMove
+    """
+    with open(filename) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            tick, _, rest = line.partition(': ')
+            head, _, payload = rest.partition(' ')
+            if head in (GameSysActions.MAP.value, GameSysActions.PLAYER_ADDED.value):
+                yield int(tick), GameSysAction(GameSysActions(head), jsonplus.loads(payload))
+            else:
+                yield int(tick), PlayerMove(int(head), PlayerActions(payload))
+
+
+def load_map(game, game_map):
+    """
+    Puts the entities of a recorded map into the game, as Game.generate_map would have
+    """
+    def respawn_ammo():
+        game._enqueue_effect(DelayedEffectType.SPAWN_AMMO, ttl=game.AMMO_RESPAWN_TTL)
+
+    game._reset_state()
+    game._enqueue_effect(DelayedEffectType.SPAWN_TREASURE,
+                         ttl=random.randint(game.TREASURE_SPAWN_FREQUENCY_MIN, game.TREASURE_SPAWN_FREQUENCY_MAX))
+    # JSON turned the column and row keys into strings, player tags are their ids
+    for x, column in game_map.items():
+        for y, tag in column.items():
+            pos = (int(x), int(y))
+            if isinstance(tag, int):
+                game.players[tag].pos = pos
+            elif tag == Game._IndestructibleBlock.Tag:
+                game.static_block_list.append(Game._IndestructibleBlock(pos))
+            elif tag == Game._SoftBlock.Tag:
+                game.value_block_list.append(Game._SoftBlock(pos, game.SOFTBLOCK_HP))
+            elif tag == Game._OreBlock.Tag:
+                game.value_block_list.append(Game._OreBlock(pos, game.ORE_BLOCK_HP))
+            elif tag == Game._Ammunitation.Tag:
+                game.ammunition_list.append(Game._Ammunitation(pos, ttl=game.AMMO_PERISH_TTL, on_perish=respawn_ammo))
+            elif tag == Game._Treasure.Tag:
+                game.treasure_list.append(Game._Treasure(pos))
+
+
+def step(game, moves, observers):
+    """
+    Plays one tick with the recorded moves, in the order the engine applied them. Returns the
+    game state and the player states the engine sent at the end of the tick
+    """
+    for move in moves:
+        game._apply_action(move.pid, move.action)
+    for observer in observers.values():
+        observer.player_state = None
+    game.tick(sync_driver.TICK_STEP)
+
+    game_state = next((observer.game_state for observer in observers.values()), None)
+    player_states = {pid: observer.player_state for pid, observer in observers.items() if observer.player_state}
+    return game_state, player_states
+
+
+def recorded_ticks(filename, seed=None, max_iterations=sync_driver.MAX_ITERATIONS):
+    """
+    Yields (game, observers, moves) before every tick of a recording, for the caller to play
+    the tick with step before asking for the next one. The seed only decides where ammo and
+    treasure respawn
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    game = Game(max_iterations=max_iterations)
+    observers = {}
+    moves = []  # recorded moves of the tick being played
+    for tick, event in read_events(filename):
+        if isinstance(event, GameSysAction):
+            if event.action == GameSysActions.PLAYER_ADDED:
+                observer = Observer()
+                observers[game.add_agent(observer, event.payload)] = observer
+            elif event.action == GameSysActions.MAP:
+                load_map(game, event.payload)
+            continue
+
+        while game.tick_counter < tick and not game.is_over:
+            yield game, observers, moves
+            moves = []
+        if game.is_over:
+            return
+        moves.append(event)
+
+    if moves and not game.is_over:
+        yield game, observers, moves
+
+
+def replay(filename, **kwargs):
+    """
+    Yields (game_state, {pid: player_state}) for every tick of a recording, the player states
+    being those of the players alive at the end of the tick
+    """
+    for game, observers, moves in recorded_ticks(filename, **kwargs):
+        yield step(game, moves, observers)
+
+
+def replay_player(filename, pid, **kwargs):
+    """
+    Yields the (game_state, player_state) pairs one player was sent, while it was alive
+    """
+    for game_state, player_states in replay(filename, **kwargs):
+        if pid in player_states:
+            yield game_state, player_states[pid]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded match through an agent')
+    parser.add_argument('recording', help='file written by FileRecorder')
+    parser.add_argument('--agent', type=str, default='wizard_agent', help='agent module')
+    parser.add_argument('--player', type=int, default=0, help='player id whose states the agent is sent')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the ammo and treasure respawns')
+    args = parser.parse_args()
+
+    agent = sync_driver.Driver(args.agent).agent()
+    moves = {}
+    start = time.time()
+    game_state = player_state = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game_state, player_state in replay_player(args.recording, args.player, seed=args.seed):
+            agent.update(game_state, player_state)
+            move = agent.next_move()
+            moves[move] = moves.get(move, 0) + 1
+        if game_state is not None:
+            agent.on_game_over(game_state, player_state)
+    elapsed = time.time() - start
+
+    latencies = sorted(agent.latencies)
+    if not latencies:
+        print(f"no states of player {args.player} in {args.recording}")
+        return
+    mean_ms = 1000 * sum(latencies) / len(latencies)
+    p99_ms = 1000 * latencies[int(0.99 * (len(latencies) - 1))]
+    print(f"{len(latencies)} ticks in {elapsed:.2f}s, latency mean {mean_ms:.2f}ms, p99 {p99_ms:.2f}ms")
+    print('moves: ' + ', '.join(f"{move!r} {count}" for move, count in sorted(moves.items(), key=str)))
+
+
+if __name__ == '__main__':
+    main()
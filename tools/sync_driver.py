@@ -0,0 +1,161 @@
+"""
+In-process agent driver for offline evaluation.
+
+The engine's multiprocess driver pickles every state through queues and polls for the answer,
+so a slow agent silently loses moves. This driver calls next_move(game_state, player_state)
+directly and waits for it, which makes a match reproducible from its seed. Usage, from the
+repository root:
+
+    python tools/sync_driver.py wizard_agent agent-prototypes/flee_bot.py --seed 3
+"""
+import argparse
+import contextlib
+import importlib
+import importlib.util
+import io
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from coderone.dungeon.agent_driver import simple_driver
+from coderone.dungeon.game import Game, Recorder
+from coderone.dungeon.game_recorder import FileRecorder
+
+TICK_STEP = 0.1
+MAX_ITERATIONS = 180 * 10
+
+# the wizard agent gives up planning at a wall-clock deadline, which would make seeded matches
+# depend on machine load. Agents driven from here plan without one unless it is set explicitly
+os.environ.setdefault('WIZARD_TICK_DEADLINE', 'none')
+
+
+class SyncAgent:
+    """
+    Agent handed to the game that decides on the last state it was sent as soon as it is asked
+    for a move, timing every decision
+    """
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.game_state = None
+        self.player_state = None
+        self.latencies = []
+
+    def update(self, game_state, player_state):
+        self.game_state = game_state
+        self.player_state = player_state
+
+    def next_move(self):
+        if self.game_state is None:
+            return None
+        start = time.perf_counter()
+        move = self.proxy.next_move(self.game_state, self.player_state)
+        self.latencies.append(time.perf_counter() - start)
+        return move
+
+    def on_game_over(self, game_state, player_state):
+        if hasattr(self.proxy.agent, 'on_game_over'):
+            self.proxy.on_game_over(game_state, player_state)
+
+
+class Driver(simple_driver.Driver):
+    """
+    simple_driver.Driver whose agents answer synchronously. The name may be a module name
+    or the path of an agent module (a .py file) or package (a directory). A module with
+    relative imports is loaded as a module of the given package
+    """
+
+    def __init__(self, name: str, watch: bool = False, config=None, package=None):
+        super().__init__(module_name(name, package), watch, config)
+
+    def agent(self) -> SyncAgent:
+        return SyncAgent(super().agent())
+
+
+def module_name(path, package=None):
+    """
+    Makes the agent at the path importable and returns its module name. With a package, the
+    module is loaded as <package>.<module> so its relative imports resolve in the package
+    """
+    if not os.path.exists(path):
+        return path  # already a module name
+    directory, name = os.path.split(os.path.realpath(path))
+    name = os.path.splitext(name)[0]
+    if package is not None:
+        return package_module(path, package, name)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return name
+
+
+def package_module(path, package, name):
+    """
+    Imports the module at the path as a module of the package, once, and returns its name
+    """
+    package_dir, package = os.path.split(os.path.realpath(package))
+    if package_dir not in sys.path:
+        sys.path.insert(0, package_dir)
+    importlib.import_module(package)
+    qualified = f'{package}.{name}'
+    if qualified not in sys.modules:
+        spec = importlib.util.spec_from_file_location(qualified, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[qualified] = module
+        spec.loader.exec_module(module)
+    return qualified
+
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def play_match(drivers, seed, names=None, max_iterations=MAX_ITERATIONS, quiet=True, recorder=None):
+    """
+    Plays a match between a new agent of each driver, seeded so the same seed replays the
+    same match. Returns the final game stats and the agents, in player id order
+    """
+    names = names or [driver.name for driver in drivers]
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        seed_everything(seed)
+        game = Game(max_iterations=max_iterations, recorder=recorder or Recorder())
+        agents = [driver.agent() for driver in drivers]
+        pids = [game.add_agent(agent, name) for agent, name in zip(agents, names)]
+        game.generate_map()
+
+        while not game.is_over:
+            game.tick(TICK_STEP)
+
+        game_state = game._serialize_state()
+        for pid, agent in zip(pids, agents):
+            agent.on_game_over(game_state, game._player_state(pid, game.players[pid]))
+
+    return game.stats, agents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a single match in-process')
+    parser.add_argument('agents', nargs='+', help='agent modules')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max_iterations', type=int, default=MAX_ITERATIONS)
+    parser.add_argument('--record', type=str, help='file to record the match to, see replay.py')
+    args = parser.parse_args()
+
+    start = time.time()
+    drivers = [Driver(agent) for agent in args.agents]
+    with FileRecorder(args.record) if args.record else Recorder() as recorder:
+        stats, agents = play_match(drivers, args.seed, max_iterations=args.max_iterations, recorder=recorder)
+    elapsed = time.time() - start
+
+    for pid, player in stats.players.items():
+        latencies = agents[pid].latencies
+        mean_ms = 1000 * sum(latencies) / len(latencies) if latencies else 0
+        print(f"{player.name}: score {player.score}, hp {player.hp}, mean latency {mean_ms:.2f}ms"
+              f"{' (winner)' if pid == stats.winner_pid else ''}")
+    print(f"{stats.iteration} ticks in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
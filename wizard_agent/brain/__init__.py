@@ -12,6 +12,9 @@ from . import combo_kill_strategy
 from . import retreat_strategy
 from . import smart_bomb_strategy
 from . import smart_collection_strategy
+from . import mcts_strategy
+from . import trap_strategy
+from . import chain_bomb_strategy
 
 def RandomStrategy():
     return random_strategy.RandomStrategy()
@@ -51,3 +54,16 @@ def SmartBombStrategy():
 
 def SmartCollectionStrategy():
     return smart_collection_strategy.SmartCollectionStrategy()
+
+def MctsStrategy():
+    return mcts_strategy.MctsStrategy()
+
+def TrapStrategy():
+    return trap_strategy.TrapStrategy()
+
+def ChainBombStrategy():
+    return chain_bomb_strategy.ChainBombStrategy()
+
+
+def WorldModel():
+    return utils.world_model.WorldModel()
@@ -19,22 +19,23 @@ def get_nearest_empty_wood_tile(game_state, player_state):
 
 class BombPlacementStrategy(strategy.Strategy):
     def execute(self, game_state: object, player_state: object) -> List[str]:
+        world = self.get_world(game_state, player_state)
         location = player_state.location
         nearest_empty_tile = get_nearest_empty_wood_tile(game_state, player_state)
 
         # navigate to the wood_block
         if nearest_empty_tile:
-            safe_tile_to_escape_to = utils.safe_escape(nearest_empty_tile, game_state)
-            path = utils.get_shortest_path(location, nearest_empty_tile, game_state)
+            path = world.shortest_path(location, nearest_empty_tile)
             action_seq = utils.get_path_action_seq(location, path)
             action_seq.append(constants.ACTIONS["bomb"])
-            escape_path = utils.get_shortest_path(nearest_empty_tile, safe_tile_to_escape_to, game_state)
+            escape_path = world.bomb_escape_path(nearest_empty_tile, len(action_seq))
             escape_seq = utils.get_path_action_seq(nearest_empty_tile, escape_path)
             action_seq = action_seq + escape_seq
             return action_seq
         return [constants.ACTIONS["none"]]
 
     def can_execute(self, game_state: object, player_state: object) -> bool:
+        world = self.get_world(game_state, player_state)
         ammo = player_state.ammo
 
         if not game_state.soft_blocks:
@@ -42,10 +43,10 @@ class BombPlacementStrategy(strategy.Strategy):
 
         nearest_empty_tile = get_nearest_empty_wood_tile(game_state, player_state)
         location = player_state.location
-        bombs = game_state.bombs
         safe = False
-        safe_tile_to_escape_to = False
+        escape_path = None
         if nearest_empty_tile:
-            safe = utils.is_safe_path(location, nearest_empty_tile, bombs, game_state)
-            safe_tile_to_escape_to = utils.safe_escape(nearest_empty_tile, game_state)
-        return ammo > 0 and nearest_empty_tile and safe and safe_tile_to_escape_to
+            safe = world.is_safe_path(location, nearest_empty_tile)
+            bomb_step = utils.get_bomb_step(world.shortest_path(location, nearest_empty_tile))
+            escape_path = world.bomb_escape_path(nearest_empty_tile, bomb_step)
+        return ammo > 0 and nearest_empty_tile and safe and escape_path is not None
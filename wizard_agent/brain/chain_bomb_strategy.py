@@ -1,24 +1,205 @@
+import heapq
 from typing import List
 
+import numpy as np
+
 from .strategy import Strategy
+from .utils import util_functions as utils, constants, grid_view, safe_path
+
+MAX_EVALUATIONS = 16  # placements fully evaluated per tick, a few milliseconds at most
+FORECAST_STEPS = 8  # ticks ahead the opponent is forecast, blasts later than that can't be aimed
+HIT_VALUE = constants.FIRE_REWARD
+STEP_COST = 0.1  # per tick spent walking to the placement
+MIN_VALUE = 5  # below that, leave it to the other bomb strategies
 
 
 class ChainBombStrategy(Strategy):
-    def __init__(self):
+    """
+    Places a bomb that joins the chain of bombs already on the map: either in the blast of a
+    bomb that will set it off early, or with its own blast reaching bombs it will set off
+    early. Each placement is valued by the block damage of its blast (blocks the pending
+    blasts already finish count for nothing), the chance of the whole chain catching the
+    opponent and the walk to it, and needs a way out of every blast of the chain.
+
+    The search is best-first over the candidate tiles, ordered by an upper bound of their
+    value, and stops once no remaining bound beats the best placement found, or after
+    MAX_EVALUATIONS placements. The cap is a count rather than a time budget so the same state
+    always gets the same plan
+    """
+
+    def __init__(self, max_evaluations=MAX_EVALUATIONS):
         # store arguments from combat strategy
         self.fields = {}
         self.game_state = None
         self.player_state = None
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0  # of the last search
+        self._search_key = None
+        self._best = None
 
     def execute(self, game_state: object, player_state: object) -> List[str]:
         self.game_state = game_state
         self.player_state = player_state
-        pass
+        world = self.get_world(game_state, player_state)
+        location = player_state.location
+        best = self.get_best_placement(world)
+        if best is not None:
+            tile, _, escape_path = best
+            path = world.shortest_path(location, tile)
+            action_seq = utils.get_path_action_seq(location, path)
+            action_seq.append(constants.ACTIONS["bomb"])
+            return action_seq + utils.get_path_action_seq(tile, escape_path)
+        return [constants.ACTIONS["none"]]
 
     def can_execute(self, game_state: object, player_state: object) -> bool:
         self.game_state = game_state
         self.player_state = player_state
-        return False
+        if player_state.ammo == 0:
+            return False
+        world = self.get_world(game_state, player_state)
+        return self.get_best_placement(world) is not None
 
     def update_fields(self, new_fields):
         self.fields = new_fields
+
+    def get_best_placement(self, world):
+        """
+        Returns (tile, value, escape path) of the best placement, or None. Searched once per
+        tick and location
+        """
+        key = (self.game_state.tick_number, self.player_state.location)
+        if key != self._search_key:
+            self._search_key = key
+            self._best = self.search(world)
+        return self._best
+
+    def search(self, world):
+        self.evaluations = 0
+        tick_number = self.game_state.tick_number
+        # tick each bomb goes off, chain reactions included. Read from the tracker rather than
+        # the bomb_states field, which is only as recent as the last combat strategy update
+        timers = {bomb: tick - tick_number for bomb, tick in world.bomb_tracker.detonation_ticks.items()}
+        if not timers:
+            return None
+
+        grid = world.grid
+        race_map = world.race_map
+        distances = np.array(race_map.ours).reshape(grid.height, grid.width)
+        block_values = self.get_block_values(world)
+        bounds = self.get_bounds(grid, block_values, timers, distances)
+
+        queue = [(-bound, idx) for idx, bound in enumerate(bounds.ravel().tolist()) if bound > -np.inf]
+        heapq.heapify(queue)
+        best = None
+        best_value = MIN_VALUE
+        forecast = world.opponent_forecast(FORECAST_STEPS)
+        while queue and self.evaluations < self.max_evaluations:
+            neg_bound, idx = heapq.heappop(queue)
+            if -neg_bound <= best_value:
+                break  # nothing left can beat it
+            self.evaluations += 1
+            tile = (idx % grid.width, idx // grid.width)
+            placement = self.evaluate(world, tile, int(distances[tile[1], tile[0]]), timers, block_values, forecast)
+            if placement is not None and placement[1] > best_value:
+                best = placement
+                best_value = placement[1]
+        return best
+
+    def get_block_values(self, world):
+        """
+        Returns the reward a hit on each block is worth as a (height, width) array: the share
+        of the block's reward per hit point, 0 for blocks the bombs on the map already finish
+        """
+        grid = world.grid
+        hp = world.block_tracker.hp if world.block_tracker.hp is not None else grid.block_hp
+        pending = np.zeros(grid.entities.shape, dtype=np.int8)
+        for tiles in world.bomb_tracker.blast_tiles.values():
+            for x, y in tiles:
+                pending[y, x] += 1
+        rewards = np.zeros(grid.entities.shape)
+        rewards[grid.entities == grid_view.SOFT_BLOCK] = constants.SOFT_BLOCK_REWARD
+        rewards[grid.entities == grid_view.ORE_BLOCK] = constants.ORE_BLOCK_REWARD
+        alive = (hp > pending) & (rewards > 0)
+        return np.where(alive, rewards / np.maximum(hp, 1), 0.0)
+
+    def get_bounds(self, grid, block_values, timers, distances):
+        """
+        Returns an upper bound of the value of a bomb on every tile as a (height, width) array,
+        -inf for tiles that aren't candidates: tiles we have a path to, in line with a bomb
+        within blast range or in the blast of one. The block damage bound sums every block
+        within range of the tile, as if rays went through blocks
+        """
+        power = self.player_state.power
+        height, width = grid.entities.shape
+        padded = np.pad(block_values, power)
+        damage = np.zeros((height, width))
+        for dx, dy in grid_view.DIRECTIONS:
+            for step in range(1, power + 1):
+                damage += padded[power + dy * step:power + dy * step + height,
+                                 power + dx * step:power + dx * step + width]
+
+        # tiles whose blast reaches a bomb, and tiles a bomb's blast reaches. Only a blast due
+        # within the forecast can set the chain off in time to be aimed at the opponent
+        linked = np.zeros((height, width), dtype=bool)
+        aimed = np.zeros((height, width), dtype=bool)
+        for bomb in timers:
+            linked |= grid.blast_mask(bomb, power)
+        for bomb, tiles in self.world.bomb_tracker.blast_tiles.items():
+            for x, y in tiles:
+                linked[y, x] = True
+                aimed[y, x] |= timers.get(bomb, FORECAST_STEPS) < FORECAST_STEPS
+        candidates = (distances >= 0) & grid.walkable & linked
+        bounds = damage + HIT_VALUE * aimed - STEP_COST * (np.maximum(distances, 1) + 1)
+        return np.where(candidates, bounds, -np.inf)
+
+    def evaluate(self, world, tile, distance, timers, block_values, forecast):
+        """
+        Returns (tile, value, escape path) of a bomb on the tile, or None if it joins no chain,
+        can't be reached safely or has no way out
+        """
+        grid = world.grid
+        power = self.player_state.power
+        tracker = world.bomb_tracker
+        bomb_step = max(distance, 1) + 1
+
+        # our bomb goes off on its own timer, or a tick after a blast reaches it
+        steps = dict(timers)
+        blasts = dict(tracker.blast_tiles)
+        blasts[tile] = grid.tiles(grid.blast_mask(tile, power))
+        steps[tile] = bomb_step + constants.BOMB_DURATION
+        # bombs going off before we get there have burnt out by then
+        triggered = [bomb for bomb, tiles in tracker.blast_tiles.items()
+                     if tile in tiles and timers.get(bomb, -1) >= bomb_step]
+        if triggered:
+            steps[tile] = min(steps[tile], min(timers[bomb] for bomb in triggered) + 1)
+
+        # the bombs our blast reaches go off a tick after it, and so on down the chain
+        chain = {tile}
+        queue = [(steps[tile], tile)]
+        while queue:
+            step, bomb = heapq.heappop(queue)
+            for other in blasts[bomb]:
+                if other != bomb and other in steps and step + 1 < steps[other]:
+                    steps[other] = step + 1
+                    chain.add(other)
+                    heapq.heappush(queue, (step + 1, other))
+        if not triggered and len(chain) == 1:
+            return None  # a lone bomb, left to the other strategies
+
+        if not world.is_safe_path(self.player_state.location, tile):
+            return None
+        schedule = world.blast_schedule.copy()
+        for bomb in chain:
+            schedule.add_blast([grid.width * y + x for x, y in blasts[bomb]], steps[bomb])
+        escape_path = safe_path.find_safe_path(schedule, tile, bomb_step, placed_bomb=True)
+        if escape_path is None:
+            return None
+
+        damage = sum(block_values[y, x] for x, y in blasts[tile])
+        miss = 1.0
+        for bomb in chain:
+            if steps[bomb] <= len(forecast):
+                caught = sum(forecast[steps[bomb] - 1][y, x] for x, y in blasts[bomb])
+                miss *= 1.0 - min(caught, 1.0)
+        value = damage + HIT_VALUE * (1.0 - miss) - STEP_COST * bomb_step
+        return tile, value, escape_path
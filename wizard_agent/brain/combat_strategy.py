@@ -53,9 +53,11 @@ class CombatStrategy(Strategy):
     def can_execute(self, game_state: object, player_state: object) -> bool:
         self.game_state = game_state
         self.player_state = player_state
+        world = self.get_world(game_state, player_state)
         # initialise or update state variables
-        self.escape_matrix = utils.get_escape_matrix(game_state)
-        self.update_bomb_states()
+        self.escape_matrix = world.escape_matrix
+        # tick each bomb goes off, chain reactions included
+        self.bomb_states = world.bomb_tracker.detonation_ticks
         # initialise args for strategies
         self.strategies["trap"].update_fields({
             'escape_matrix': self.escape_matrix
@@ -65,20 +67,8 @@ class CombatStrategy(Strategy):
         })
 
         return False  # TODO modify this in future
-    # Helper functions
 
-    def update_bomb_states(self):
-        bombs = self.game_state.bombs
-        cur_tick = self.game_state.tick_number
-        # record new bombs
-        for bomb in bombs:
-            if bomb not in self.bomb_states:
-                self.bomb_states[bomb] = cur_tick + constants.BOMB_DURATION
-        # remove bombs that has passed its tick
-        exploded_bombs = []
-        for bomb, tick_due in self.bomb_states.items():
-            if cur_tick >= tick_due:
-                exploded_bombs.append(bomb)
-        # delete them from bomb states
-        for bomb in exploded_bombs:
-            del self.bomb_states[bomb]
+    def bind_world(self, world):
+        super().bind_world(world)
+        for strategy in self.strategies.values():
+            strategy.bind_world(world)
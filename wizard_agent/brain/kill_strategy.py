@@ -6,28 +6,28 @@ from .utils import util_functions as utils, constants
 
 class KillStrategy(Strategy):
     def execute(self, game_state: object, player_state: object) -> List[str]:
+        world = self.get_world(game_state, player_state)
         location = player_state.location
-        opponent_list = game_state.opponents(player_state.id)
-        opponent = utils.get_opponent(location, opponent_list)
+        opponent = world.opponent
         # grabs empty tiles near opponent
-        surrounding_tiles = utils.get_surrounding_empty_tiles(opponent, game_state)
+        surrounding_tiles = world.surrounding_empty_tiles(opponent)
         reachable_tiles = utils.get_reachable_tiles(location, surrounding_tiles, game_state)
         nearest_tile = utils.get_nearest_tile(location, reachable_tiles)
         # navigate to nearest empty tile
         if nearest_tile is not None:
-            path = utils.get_shortest_path(location, nearest_tile, game_state)
+            path = world.shortest_path(location, nearest_tile)
             action_seq = utils.get_path_action_seq(location, path)
             action_seq.append(constants.ACTIONS["bomb"])
             return action_seq
         return [constants.ACTIONS["none"]]
 
     def can_execute(self, game_state: object, player_state: object) -> bool:
+        world = self.get_world(game_state, player_state)
         location = player_state.location
-        opponent_list = game_state.opponents(player_state.id)
-        opponent = utils.get_opponent(location, opponent_list)
+        opponent = world.opponent
         ammo = player_state.ammo
         # grabs empty tiles near opponent
-        surrounding_tiles = utils.get_surrounding_empty_tiles(opponent, game_state)
+        surrounding_tiles = world.surrounding_empty_tiles(opponent)
         reachable_tiles = utils.get_reachable_tiles(location, surrounding_tiles, game_state)
         # execute when player has ammo and there's a reachable tile to opponent
         return ammo > 0 and reachable_tiles
@@ -0,0 +1,271 @@
+import math
+import random
+import time
+from typing import List
+
+from .strategy import Strategy
+from .utils import constants, forward_model
+
+ACTIONS = constants.ACTIONS
+
+HP_VALUE = 50  # a hit point is worth about two hits on an opponent
+PENDING_BLOCK_VALUE = 0.5  # share of a block's reward credited while the bomb is still ticking
+DISTANCE_VALUE = 0.2  # pull, per tile, towards the nearest pickup or breakable block beyond the horizon
+
+
+class Node:
+    """
+    A state of the search tree. Players choose their actions independently (decoupled UCT), so
+    every node keeps visit counts and values per player and action, and children per joint action
+    """
+
+    __slots__ = ('model', 'children', 'visits', 'actions', 'counts', 'values')
+
+    def __init__(self, model):
+        self.model = model
+        self.children = {}
+        self.visits = 0
+        self.actions = [legal_actions(model, pid) for pid in range(len(model.player_pos))]
+        self.counts = [dict.fromkeys(actions, 0) for actions in self.actions]
+        self.values = [dict.fromkeys(actions, 0.0) for actions in self.actions]
+
+    def select(self, exploration):
+        """
+        Returns the joint action, one per player, picked by UCB1 on each player's own statistics
+        """
+        log_visits = math.log(self.visits + 1)
+        joint = []
+        for counts, values in zip(self.counts, self.values):
+            best_action = None
+            best_score = -math.inf
+            for action, count in counts.items():
+                if count == 0:
+                    best_action = action
+                    break
+                score = values[action] / count + exploration * math.sqrt(log_visits / count)
+                if score > best_score:
+                    best_action = action
+                    best_score = score
+            joint.append(best_action)
+        return tuple(joint)
+
+    def best_action(self, pid):
+        counts = self.counts[pid]
+        return max(counts, key=lambda action: (counts[action], action == ACTIONS["none"]))
+
+
+def legal_actions(model, pid):
+    """
+    Returns the actions that do something for the player: staying put, moves onto free tiles and
+    placing a bomb when it has ammo and there is no bomb underneath
+    """
+    if not model.is_alive(pid):
+        return [ACTIONS["none"]]
+    idx = model.player_pos[pid]
+    x, y = model.tile(idx)
+    actions = [ACTIONS["none"]]
+    for action, (dx, dy) in forward_model.MOVES.items():
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < model.width and 0 <= ny < model.height and model.is_free(model.width * ny + nx):
+            actions.append(action)
+    if model.player_ammo[pid] > 0 and idx not in model.bombs:
+        actions.append(ACTIONS["bomb"])
+    return actions
+
+
+def can_escape(model, pid, blast_ticks):
+    """
+    Returns true if the player can reach a tile out of every blast before the blast that
+    covers its own tile goes off. blast_ticks maps indices to the ticks left before they burn
+    """
+    start = model.player_pos[pid]
+    deadline = blast_ticks.get(start)
+    if deadline is None:
+        return True
+    width = model.width
+    height = model.height
+    seen = {start}
+    frontier = [start]
+    for dist in range(1, deadline):
+        next_frontier = []
+        for idx in frontier:
+            x, y = idx % width, idx // width
+            for dx, dy in forward_model.BLAST_DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                n_idx = width * ny + nx
+                if not (0 <= nx < width and 0 <= ny < height) or n_idx in seen or not model.is_free(n_idx):
+                    continue
+                if blast_ticks.get(n_idx, math.inf) <= dist:
+                    continue  # burns before or as we get there
+                if n_idx not in blast_ticks:
+                    return True
+                seen.add(n_idx)
+                next_frontier.append(n_idx)
+        frontier = next_frontier
+    return False
+
+
+def target_distance(model, pid):
+    """
+    Returns the number of moves from the player to the nearest ammo, treasure or tile next to a
+    breakable block, or None if there is none in reach
+    """
+    width = model.width
+    height = model.height
+    block = model.block
+    start = model.player_pos[pid]
+    seen = {start}
+    frontier = [start]
+    dist = 0
+    while frontier:
+        next_frontier = []
+        for idx in frontier:
+            if idx in model.ammo or idx in model.treasure:
+                return dist
+            x, y = idx % width, idx // width
+            for dx, dy in forward_model.BLAST_DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                n_idx = width * ny + nx
+                if block[n_idx] == forward_model.SOFT or block[n_idx] == forward_model.ORE:
+                    return dist
+                if n_idx not in seen and model.is_free(n_idx):
+                    seen.add(n_idx)
+                    next_frontier.append(n_idx)
+        frontier = next_frontier
+        dist += 1
+    return None
+
+
+def evaluate(model, pid):
+    """
+    Returns the value of the model for the player: its lead in reward and hit points, the
+    blocks its ticking bombs are going to break, and the hit points it can't save from the
+    fire and bombs already on the map, less a little for each move to its nearest target
+    """
+    blast_ticks = {}
+    pending = [0.0] * len(model.player_pos)
+    for idx, (ticks_to_live, power, owner) in model.bombs.items():
+        for f_idx in model.blast(idx, power):
+            blast_ticks[f_idx] = min(blast_ticks.get(f_idx, math.inf), ticks_to_live + 1)
+            kind = model.block[f_idx]
+            if owner != forward_model.NO_OWNER and (kind == forward_model.SOFT or kind == forward_model.ORE):
+                pending[owner] += PENDING_BLOCK_VALUE * forward_model.BLOCK_REWARDS[kind] / max(model.block_hp[f_idx], 1)
+    fire = {idx for idx, _ in model.fire}
+
+    scores = []
+    for player in range(len(model.player_pos)):
+        hp = model.player_hp[player]
+        if hp > 0 and model.player_pos[player] in fire:
+            hp -= 1
+        if hp > 0 and not can_escape(model, player, blast_ticks):
+            hp -= 1
+        scores.append(model.player_reward[player] + pending[player] + HP_VALUE * max(hp, 0))
+
+    best_opponent = max((score for player, score in enumerate(scores) if player != pid), default=0)
+    distance = target_distance(model, pid)
+    return scores[pid] - best_opponent - DISTANCE_VALUE * (distance or 0)
+
+
+class MctsStrategy(Strategy):
+    """
+    Monte Carlo tree search over the joint actions of all players, played out on the forward
+    model for a fixed horizon. The tree is kept between ticks: when the state seen on a new tick
+    is the one a child of the root predicted, that child becomes the root and its statistics
+    are reused. Search stops when the time budget of the tick runs out. Playouts draw from the
+    strategy's own generator, so searching leaves the random stream of the engine untouched
+    """
+
+    def __init__(self, horizon=8, time_budget=0.02, exploration=20.0, max_iterations=5000, seed=0):
+        self.horizon = horizon
+        self.time_budget = time_budget  # seconds of search per tick
+        self.exploration = exploration
+        self.max_iterations = max_iterations
+        self.random = random.Random(seed)
+        self.root = None
+        self.pid = None
+        self.last_action = None
+        self.tick_number = None
+        self.reused = 0  # ticks that started from a subtree of the previous search
+        self.iterations = 0  # of the last search
+
+    def execute(self, game_state: object, player_state: object) -> List[str]:
+        self.search(game_state, player_state)
+        self.last_action = self.root.best_action(self.pid)
+        return [self.last_action]
+
+    def can_execute(self, game_state: object, player_state: object) -> bool:
+        return len(game_state.opponents()) > 1
+
+    def search(self, game_state, player_state):
+        """
+        Grows the tree from the current state until the time budget, or the agent's deadline,
+        runs out. At least one iteration is run so there is an action to play
+        """
+        deadline = time.perf_counter() + self.time_budget
+        if self.deadline is not None:
+            deadline = min(deadline, self.deadline)
+        world = self.get_world(game_state, player_state)
+        self.pid = player_state.id
+        self.root = self.get_root(forward_model.from_world(world), game_state.tick_number)
+        self.tick_number = game_state.tick_number
+
+        self.iterations = 0
+        while self.iterations < self.max_iterations and (self.iterations == 0 or time.perf_counter() < deadline):
+            self.iterate(self.root)
+            self.iterations += 1
+
+    def get_root(self, model, tick_number):
+        """
+        Returns the child of the last root whose prediction matches the model, or a new root
+        """
+        if self.root is not None and self.tick_number == tick_number - 1:
+            signature = self.signature(model)
+            for joint, child in self.root.children.items():
+                if joint[self.pid] == self.last_action and self.signature(child.model) == signature:
+                    self.reused += 1
+                    return child
+        return Node(model)
+
+    def signature(self, model):
+        return model.player_pos, model.player_hp, model.bombs.keys(), model.block, model.ammo.keys(), model.treasure
+
+    def iterate(self, root):
+        """
+        Runs one selection, expansion, playout and backup from the root
+        """
+        end_tick = root.model.tick_number + self.horizon
+        node = root
+        path = []
+        while node.model.tick_number < end_tick:
+            joint = node.select(self.exploration)
+            path.append((node, joint))
+            child = node.children.get(joint)
+            if child is None:
+                model = node.model.copy()
+                model.step(dict(enumerate(joint)))
+                child = Node(model)
+                node.children[joint] = child
+                node = child
+                break
+            node = child
+
+        value = self.playout(node, end_tick)
+        for visited, joint in path:
+            visited.visits += 1
+            for player, action in enumerate(joint):
+                visited.counts[player][action] += 1
+                visited.values[player][action] += value if player == self.pid else -value
+
+    def playout(self, node, end_tick):
+        """
+        Plays random legal actions up to the end tick and returns the value of the result for us
+        """
+        model = node.model
+        if model.tick_number < end_tick:
+            model = model.copy()
+            while model.tick_number < end_tick and not model.is_over:
+                model.step({player: self.random.choice(legal_actions(model, player))
+                            for player in range(len(model.player_pos))})
+        return evaluate(model, self.pid)
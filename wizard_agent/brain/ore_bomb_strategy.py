@@ -42,62 +42,47 @@ def get_nearest_empty_ore_tile(location, ores, game_state):
 
 
 class OreBombStrategy(strategy.Strategy):
-    def __init__(self):
-        self.ore_state = {}
-    
     def execute(self, game_state: object, player_state: object) -> List[str]:
+        world = self.get_world(game_state, player_state)
         location = player_state.location
         ore_blocks = game_state.ore_blocks
 
-        # add ores into state
-        for ore in ore_blocks:
-            if ore not in self.ore_state:
-                self.ore_state[ore] = 3
-
-        # TODO update ore state to account for other player
-
-        urgent_ores = get_urgent_ores(self.ore_state)
+        # ore hit points are tracked from the explosions of both players
+        urgent_ores = get_urgent_ores(world.block_tracker.ore_hp())
         # get the nearest block to the player
         if urgent_ores:
             # grab the nearest empty tile to put bomb
             nearest_tile = get_nearest_empty_ore_tile(location, urgent_ores, game_state)
-            safe_tile_to_escape_to = utils.safe_escape(nearest_tile, game_state)
-            nearest_ore = utils.get_nearest_tile(nearest_tile, urgent_ores)
-            # remove ore from ore_state
-            self.ore_state.pop(nearest_ore)
-            path = utils.get_shortest_path(location, nearest_tile, game_state)
+            path = world.shortest_path(location, nearest_tile)
             action_seq = utils.get_path_action_seq(location, path)
             action_seq.append(ACTIONS["bomb"])
-            escape_path = utils.get_shortest_path(nearest_tile, safe_tile_to_escape_to, game_state)
+            escape_path = world.bomb_escape_path(nearest_tile, len(action_seq))
             escape_seq = utils.get_path_action_seq(nearest_tile, escape_path)
             action_seq = action_seq + escape_seq
             return action_seq
         else:
             nearest_tile = get_nearest_empty_ore_tile(location, ore_blocks, game_state)
-            safe_tile_to_escape_to = utils.safe_escape(nearest_tile, game_state)
-            nearest_ore = utils.get_nearest_tile(nearest_tile, ore_blocks)
-            # decrease ore state value
-            self.ore_state[nearest_ore] -= 1
-            path = utils.get_shortest_path(location, nearest_tile, game_state)
+            path = world.shortest_path(location, nearest_tile)
             action_seq = utils.get_path_action_seq(location, path)
             action_seq.append(ACTIONS["bomb"])
-            escape_path = utils.get_shortest_path(nearest_tile, safe_tile_to_escape_to, game_state)
+            escape_path = world.bomb_escape_path(nearest_tile, len(action_seq))
             escape_seq = utils.get_path_action_seq(nearest_tile, escape_path)
             action_seq = action_seq + escape_seq
             return action_seq
 
     def can_execute(self, game_state: object, player_state: object) -> bool:
+        world = self.get_world(game_state, player_state)
         location = player_state.location
         ammo = player_state.ammo
-        bombs = game_state.bombs
         ore_blocks = game_state.ore_blocks
         if len(ore_blocks) == 0:
             return False
 
         nearest_tile = get_nearest_empty_ore_tile(location, ore_blocks, game_state)
         safe = False
-        safe_tile_to_escape_to = False
+        escape_path = None
         if nearest_tile is not None:
-            safe = utils.is_safe_path(location, nearest_tile, bombs, game_state)
-            safe_tile_to_escape_to = utils.safe_escape(nearest_tile, game_state)
-        return ammo > 0 and nearest_tile and safe and safe_tile_to_escape_to
+            safe = world.is_safe_path(location, nearest_tile)
+            bomb_step = utils.get_bomb_step(world.shortest_path(location, nearest_tile))
+            escape_path = world.bomb_escape_path(nearest_tile, bomb_step)
+        return ammo > 0 and nearest_tile and safe and escape_path is not None
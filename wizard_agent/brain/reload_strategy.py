@@ -41,6 +41,7 @@ class ReloadStrategy(strategy.Strategy):
         location = player_state.location
         list_of_opponents = game_state.opponents(player_state.id)
         opponent_location = utils.get_opponent(location, list_of_opponents)
+        race_map = self.get_world(game_state, player_state).race_map
 
         ammos = utils.get_reachable_tiles(location, ammo, game_state)
         # get the nearest ammo to the player
@@ -51,7 +52,7 @@ class ReloadStrategy(strategy.Strategy):
 
         # navigate to the ammo
         if nearest_ammo is not None:
-            if not utils.is_opponent_closer(location, opponent_location, nearest_ammo):
+            if not race_map.is_opponent_closer(nearest_ammo):
                 path = utils.get_shortest_path(location, nearest_ammo, game_state)
                 action_seq = utils.get_path_action_seq(location, path)
                 return action_seq
@@ -69,6 +70,7 @@ class ReloadStrategy(strategy.Strategy):
         location = player_state.location
         list_of_opponents = game_state.opponents(player_state.id)
         opponent_location = utils.get_opponent(location, list_of_opponents)
+        race_map = self.get_world(game_state, player_state).race_map
         ammo_pickups = game_state.ammo
         ammo_in_range = utils.get_reachable_tiles(location, ammo_pickups, game_state)
 
@@ -77,7 +79,7 @@ class ReloadStrategy(strategy.Strategy):
         nearest_ammo = _get_nearest_ammo(location, ammo_in_range)
 
         # define execution conditions
-        is_opponent_closer = utils.is_opponent_closer(location, opponent_location, nearest_ammo)
+        is_opponent_closer = race_map.is_opponent_closer(nearest_ammo)
 
         # check safety
         furthest_ammo_safe = True
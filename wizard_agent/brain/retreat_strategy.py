@@ -1,5 +1,7 @@
 from typing import List
-import operator
+
+import numpy as np
+
 from .strategy import Strategy
 from .utils import util_functions as utils, constants
 
@@ -27,15 +29,15 @@ class RetreatStrategy(Strategy):
     def execute(self, game_state: object, player_state: object) -> List[str]:
         self.game_state = game_state
         self.player_state = player_state
-        self.escape_matrix = utils.get_escape_matrix(game_state)
+        world = self.get_world(game_state, player_state)
+        self.escape_matrix = world.escape_matrix
         # fields
         location = self.player_state.location
-        opponent_list = self.game_state.opponents(self.player_state.id)
-        opponent = utils.get_opponent(location, opponent_list)
+        opponent = world.opponent
         # get ideal tile
         ideal_tile = self.get_ideal_tile(location, opponent)
         if ideal_tile is not None:
-            path = utils.get_shortest_path(location, ideal_tile, game_state)
+            path = world.shortest_path(location, ideal_tile)
             action_seq = utils.get_path_action_seq(location, path)
             return action_seq
         return [constants.ACTIONS["none"]]
@@ -43,57 +45,42 @@ class RetreatStrategy(Strategy):
     def can_execute(self, game_state: object, player_state: object) -> bool:
         self.game_state = game_state
         self.player_state = player_state
-        self.escape_matrix = utils.get_escape_matrix(game_state)
+        world = self.get_world(game_state, player_state)
+        self.escape_matrix = world.escape_matrix
         location = self.player_state.location
-        opponent_list = self.game_state.opponents(self.player_state.id)
-        opponent = utils.get_opponent(location, opponent_list)
+        opponent = world.opponent
         ideal_tile = self.get_ideal_tile(location, opponent)
         return ideal_tile is not None
 
     def get_ideal_tile(self, location, opponent):
-        tile_map = self.get_tile_map()
-        p_tile_map = dict(sorted(tile_map.items(), key=operator.itemgetter(1), reverse=True))
-        possible_tiles = list(p_tile_map.keys())
-        ideal_tile = None
-        while len(possible_tiles) > 0:
-            tile = possible_tiles.pop(0)
-            path = utils.get_shortest_path(location, tile, self.game_state)
-            if path and not utils.is_opponent_closer(location, opponent, tile):
-                ideal_tile = tile
-                break
-        return ideal_tile
-
-    def get_tile_map(self):
-        size = self.game_state.size
-        width = size[0]
-        height = size[1]
-        tile_map = {}
-        for y in range(height):
-            for x in range(width):
-                tile = (x, y)
-                score = self.get_score(tile)
-                tile_map[tile] = score
-        return tile_map
-
-    def get_score(self, tile):
-        size = self.game_state.size
-        width = size[0]
-        location = self.player_state.location
-        opponent_list = self.game_state.opponents(self.player_state.id)
-        opponent = utils.get_opponent(location, opponent_list)
-        player_escape = len(utils.get_surrounding_empty_tiles(location, self.game_state))
-        bombs = self.game_state.bombs
-        x = tile[0]
-        y = tile[1]
-
-        danger_zones = []
-        for bomb in bombs:
-            blast_zone = utils.get_blast_zone(bomb, self.game_state)
-            danger_zones += blast_zone
+        """
+        Returns the best scored tile we have a path to (other than where we stand) and that the
+        opponent doesn't reach first, or None. Ties go to the first tile in width * y + x order
+        """
+        race_map = self.world.race_map
+        ours = np.array(race_map.ours).reshape(race_map.height, race_map.width)
+        eligible = (ours > 0) & (np.array(race_map.margins).reshape(ours.shape) >= 0)
+        if not eligible.any():
+            return None
+        score_field = np.where(eligible, self.get_score_field(opponent), -np.inf)
+        idx = int(np.argmax(score_field))
+        return idx % race_map.width, idx // race_map.width
 
-        idx = width * y + x
-        e = player_escape if tile == location else self.escape_matrix[idx]  # number of escape paths
-        b = 0 if tile in danger_zones else 1  # blast zone factor
-        dist_o = utils.manhattan_distance(opponent, tile)  # dist from opponent
-        dist_p = utils.manhattan_distance(location, tile)  # dist from player
-        return (e * b * dist_o) - dist_p
+    def get_score_field(self, opponent):
+        """
+        Returns the retreat score of every tile as a (height, width) array:
+        escape paths * blast zone factor * distance from the opponent - distance from the player.
+        Escape paths are divided by one more than the steps into a dead end, where the opponent
+        can shut us in. Distances are path lengths; tiles the opponent has no path to count at
+        their manhattan distance from it, since the blocks in between may yet be blown up
+        """
+        race_map = self.world.race_map
+        shape = (race_map.height, race_map.width)
+        depth = np.maximum(np.array(self.world.graph_index.depth).reshape(shape), 0)
+        e = np.array(self.escape_matrix).reshape(shape) / (1 + depth)  # number of escape paths
+        b = ~self.world.danger_map.dangerous  # blast zone factor
+        ys, xs = np.indices(shape)
+        theirs = np.array(race_map.theirs).reshape(shape)
+        dist_o = np.where(theirs != -1, theirs, np.abs(xs - opponent[0]) + np.abs(ys - opponent[1]))
+        dist_p = np.array(race_map.ours).reshape(shape)
+        return e * b * dist_o - dist_p
@@ -3,8 +3,15 @@ Interface for defining strategy pattern.
 """
 from typing import List
 
+from .utils import world_model
+
 
 class Strategy:
+    # per-tick world model shared between strategies, bound by the agent
+    world = None
+    # time.perf_counter() the agent must have decided by this tick, None without a deadline
+    deadline = None
+
     def execute(self, game_state: object, player_state: object) -> List[str]:
         """
         Execute the strategy
@@ -16,3 +23,25 @@ class Strategy:
         Returns whether or not the strategy can execute
         """
         pass
+
+    def bind_world(self, world):
+        """
+        Shares a world model with this strategy
+        """
+        self.world = world
+
+    def set_deadline(self, deadline):
+        """
+        Sets the time the agent must have decided by this tick. Strategies that search for a
+        set time stop there at the latest
+        """
+        self.deadline = deadline
+
+    def get_world(self, game_state: object, player_state: object):
+        """
+        Returns the world model updated to the given state. Strategies without a shared
+        world model get their own
+        """
+        if self.world is None:
+            self.world = world_model.WorldModel()
+        return self.world.update(game_state, player_state)
@@ -1,9 +1,17 @@
 from typing import List
 
 from .strategy import Strategy
+from .utils import util_functions as utils, constants
 
 
 class TrapStrategy(Strategy):
+    """
+    Seals the opponent in the dead end it is standing in: a bomb on the mouth of the pocket
+    blocks its only way out, and if the blast reaches every tile behind the mouth there is
+    nowhere left to hide. We must get to the mouth before the opponent does and have a way
+    out of our own blast
+    """
+
     def __init__(self):
         # store arguments from combat strategy
         self.fields = {}
@@ -13,12 +21,57 @@ class TrapStrategy(Strategy):
     def execute(self, game_state: object, player_state: object) -> List[str]:
         self.game_state = game_state
         self.player_state = player_state
-        pass
+        world = self.get_world(game_state, player_state)
+        location = player_state.location
+        mouth = self.get_trap_tile(world, location)
+        if mouth is not None:
+            path = world.shortest_path(location, mouth)
+            action_seq = utils.get_path_action_seq(location, path)
+            action_seq.append(constants.ACTIONS["bomb"])
+            escape_path = world.bomb_escape_path(mouth, utils.get_bomb_step(path))
+            escape_seq = utils.get_path_action_seq(mouth, escape_path)
+            return action_seq + escape_seq
+        return [constants.ACTIONS["none"]]
 
     def can_execute(self, game_state: object, player_state: object) -> bool:
         self.game_state = game_state
         self.player_state = player_state
-        return False
+        if player_state.ammo == 0:
+            return False
+        world = self.get_world(game_state, player_state)
+        return self.get_trap_tile(world, player_state.location) is not None
+
+    def get_trap_tile(self, world, location):
+        """
+        Returns the mouth of the pocket the opponent is in if bombing it traps the opponent,
+        or None
+        """
+        opponent = world.opponent
+        if opponent is None:
+            return None
+        index = world.graph_index
+        pocket = index.pocket(opponent)
+        if pocket is None:
+            return None
+        mouth, _ = pocket
+        if location != mouth and index.pocket(location) == pocket:
+            return None  # we are in there with it
+
+        # we must stand on the mouth before the opponent can step onto it
+        race_map = world.race_map
+        ours, _ = race_map.arrivals(mouth)
+        if ours is None or race_map.margin(mouth) <= 0:
+            return None
+        if not world.is_safe_path(location, mouth):
+            return None
+
+        blast = set(utils.get_blast_zone(mouth, self.game_state, self.player_state.power))
+        if not all(tile in blast for tile in index.pocket_tiles(mouth)):
+            return None
+        bomb_step = utils.get_bomb_step(world.shortest_path(location, mouth))
+        if world.bomb_escape_path(mouth, bomb_step) is None:
+            return None
+        return mouth
 
     def update_fields(self, new_fields):
         self.fields = new_fields
@@ -41,6 +41,7 @@ class TreasureStrategy(strategy.Strategy):
         treasure = game_state.treasure
         list_of_opponents = game_state.opponents(player_state.id)
         opponent_location = utils.get_opponent(location, list_of_opponents)
+        race_map = self.get_world(game_state, player_state).race_map
         treasures = utils.get_reachable_tiles(location, treasure, game_state)
         # get the nearest treasure to the player
         nearest_treasure = _get_nearest_treasure(location, treasures)
@@ -50,7 +51,7 @@ class TreasureStrategy(strategy.Strategy):
 
         # navigate to the treasure
         if nearest_treasure is not None:
-            if not utils.is_opponent_closer(location, opponent_location, nearest_treasure):
+            if not race_map.is_opponent_closer(nearest_treasure):
                 path = utils.get_shortest_path(location, nearest_treasure, game_state)
                 action_seq = utils.get_path_action_seq(location, path)
                 return action_seq
@@ -69,10 +70,11 @@ class TreasureStrategy(strategy.Strategy):
         bombs = game_state.bombs
         list_of_opponents = game_state.opponents(player_state.id)
         opponent_location = utils.get_opponent(location, list_of_opponents)
+        race_map = self.get_world(game_state, player_state).race_map
         reachable_treasure = utils.get_reachable_tiles(location, treasures, game_state)
         furthest_treasure = _get_furthest_treasure_from_opponent(opponent_location, reachable_treasure)
         nearest_treasure = _get_nearest_treasure(location, reachable_treasure)
-        is_opponent_closer = utils.is_opponent_closer(location, opponent_location, nearest_treasure)
+        is_opponent_closer = race_map.is_opponent_closer(nearest_treasure)
 
         closest_treasure_safe = False
         furthest_treasure_safe = False
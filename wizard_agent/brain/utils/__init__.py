@@ -1,2 +1,14 @@
 from . import constants
+from . import block_tracker
+from . import bomb_tracker
+from . import danger_map
+from . import decision_log
+from . import forward_model
+from . import graph_index
+from . import opponent_tracker
+from . import plan
+from . import profiler
+from . import safe_path
+from . import target_scorer
 from . import util_functions
+from . import world_model
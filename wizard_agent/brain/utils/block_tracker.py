@@ -0,0 +1,74 @@
+"""
+Tracks the hit points of soft and ore blocks from the explosions seen between ticks.
+"""
+import numpy as np
+
+from . import constants
+
+
+class BlockTracker:
+    """
+    Keeps the hit points of every destructible block in a (height, width) array. Each tick
+    only the cells caught by new explosions are decremented, and blocks that vanished are
+    zeroed, so the cost of an update is proportional to what changed. A hit is counted on the
+    tick its bomb vanishes from the map, one tick before the engine applies it
+    """
+
+    def __init__(self):
+        self.tick_number = None
+        self.hp = None
+        self.blocks = set()
+        self.ore_blocks = set()
+        self.hp_before_hits = {}  # block -> hit points before the explosions of the last update
+
+    def update(self, game_state, explosions):
+        """
+        Feeds the tracker the state of a new tick and the blast tiles of the bombs that went
+        off since the last one
+        """
+        if game_state.tick_number == self.tick_number:
+            return
+        self.tick_number = game_state.tick_number
+        ore_blocks = set(game_state.ore_blocks)
+        blocks = set(game_state.soft_blocks) | ore_blocks
+
+        if self.hp is None:
+            width, height = game_state.size
+            self.hp = np.zeros((height, width), dtype=np.int8)
+            for x, y in game_state.soft_blocks:
+                self.hp[y, x] = constants.SOFT_BLOCK_HP
+            for x, y in ore_blocks:
+                self.hp[y, x] = constants.ORE_BLOCK_HP
+        else:
+            self.hp_before_hits = {}
+            for blast_tiles in explosions:
+                for x, y in blast_tiles:
+                    if (x, y) in blocks:
+                        self.hp_before_hits.setdefault((x, y), int(self.hp[y, x]))
+                        # a block still standing has at least one hit point left
+                        self.hp[y, x] = max(self.hp[y, x] - 1, 1)
+            for x, y in self.blocks - blocks:
+                self.hp[y, x] = 0
+
+        self.blocks = blocks
+        self.ore_blocks = ore_blocks
+
+    def hp_at(self, tile):
+        """
+        Returns the hit points of the block on the tile, 0 if there is none
+        """
+        if self.hp is None:
+            return 0
+        return int(self.hp[tile[1], tile[0]])
+
+    def ore_hp(self):
+        """
+        Returns the hit points of every ore block
+        """
+        return {ore: int(self.hp[ore[1], ore[0]]) for ore in self.ore_blocks}
+
+    def urgent_ores(self):
+        """
+        Returns the ore blocks a single hit away from breaking
+        """
+        return [ore for ore in self.ore_blocks if self.hp[ore[1], ore[0]] == 1]
@@ -0,0 +1,118 @@
+"""
+Tracks bomb timers across ticks, including bombs set off early by other blasts.
+"""
+import heapq
+
+from . import constants
+from . import util_functions as utils
+
+
+class BombTracker:
+    """
+    Remembers when each bomb was placed and its power, and computes the tick its blast
+    burns. A bomb caught in another blast burns one tick after it, so detonation ticks are
+    propagated through the blast graph (bomb -> bombs its blast reaches) shortest-path style.
+    The graph is rebuilt in full on ticks where bombs appear or vanish or blocks break, since a
+    broken block lets blasts reach further
+    """
+
+    def __init__(self):
+        self.tick_number = None
+        self.placed_ticks = {}
+        self.powers = {}
+        self.detonation_ticks = {}
+        self.blast_tiles = {}  # bomb -> tiles reached by its blast
+        self.triggers = {}  # bomb -> bomb that sets it off early, if any
+        self.explosions = []  # (tick, bomb, blast tiles) of bombs that went off
+        self.blockers = None  # blocker mask the blast graph was built on
+        self.changed = False  # whether bombs or blocks changed on the last update
+
+    def update(self, game_state, player_state):
+        """
+        Feeds the tracker the state of a new tick
+        """
+        if game_state.tick_number == self.tick_number:
+            return
+        self.tick_number = game_state.tick_number
+        bombs = game_state.bombs
+
+        exploded = [bomb for bomb in self.placed_ticks if bomb not in bombs]
+        for bomb in exploded:
+            self.explosions.append((self.tick_number, bomb, self.blast_tiles[bomb]))
+            del self.placed_ticks[bomb]
+            del self.powers[bomb]
+        self.explosions = [e for e in self.explosions if self.tick_number - e[0] < constants.EXPLOSION_TICKS]
+
+        placed = [bomb for bomb in bombs if bomb not in self.placed_ticks]
+        for bomb in placed:
+            self.placed_ticks[bomb] = self.tick_number
+            # only our own power is known, opponents are assumed to have the starting power
+            self.powers[bomb] = player_state.power if bomb == player_state.location else constants.BLAST_POWER
+
+        grid = utils.get_grid_view(game_state)
+        blocks_changed = self.blockers is None or not (grid.blockers == self.blockers).all()
+        self.changed = bool(exploded or placed or blocks_changed)
+        if self.changed:
+            self._propagate(grid)
+
+    def _propagate(self, grid):
+        self.blockers = grid.blockers
+        self.blast_tiles = {}
+        reaches = {}
+        for bomb, power in self.powers.items():
+            tiles = grid.tiles(grid.blast_mask(bomb, power))
+            self.blast_tiles[bomb] = tiles
+            reaches[bomb] = [tile for tile in tiles if tile != bomb and tile in self.powers]
+
+        # every bomb starts at its own timer, chains can only bring that forward
+        self.detonation_ticks = {bomb: tick + constants.BOMB_DURATION for bomb, tick in self.placed_ticks.items()}
+        self.triggers = {}
+
+        # bombs that vanished this tick burn next tick and set off what their blast reaches
+        for tick, exploded_bomb, tiles in self.explosions:
+            if tick != self.tick_number:
+                continue
+            for tile in tiles:
+                if tile in self.detonation_ticks and tick + 2 < self.detonation_ticks[tile]:
+                    self.detonation_ticks[tile] = tick + 2
+                    self.triggers[tile] = exploded_bomb
+        queue = [(tick, bomb) for bomb, tick in self.detonation_ticks.items()]
+        heapq.heapify(queue)
+        while queue:
+            tick, bomb = heapq.heappop(queue)
+            if tick > self.detonation_ticks[bomb]:
+                continue  # stale entry
+            for other in reaches[bomb]:
+                if tick + 1 < self.detonation_ticks[other]:
+                    self.detonation_ticks[other] = tick + 1
+                    self.triggers[other] = bomb
+                    heapq.heappush(queue, (tick + 1, other))
+
+    def ticks_left(self, bomb):
+        """
+        Returns the ticks left before the bomb's blast burns, or None for unknown bombs
+        """
+        if bomb not in self.detonation_ticks:
+            return None
+        return self.detonation_ticks[bomb] - self.tick_number
+
+    def timers(self):
+        """
+        Returns the ticks left of every tracked bomb
+        """
+        return {bomb: tick - self.tick_number for bomb, tick in self.detonation_ticks.items()}
+
+    def latest_blast_tiles(self):
+        """
+        Returns the blast tiles of each bomb that went off since the previous update
+        """
+        return [tiles for tick, _, tiles in self.explosions if tick == self.tick_number]
+
+    def recent_blast_tiles(self):
+        """
+        Returns the tiles hit by bombs that went off within the last few ticks
+        """
+        tiles = []
+        for _, _, blast_tiles in self.explosions:
+            tiles = tiles + blast_tiles
+        return tiles
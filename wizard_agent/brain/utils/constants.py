@@ -10,3 +10,20 @@ ACTIONS = {
 ACTION_LIST = ['', 'u', 'd', 'l', 'r', 'p']
 
 BOMB_DURATION = 35
+EXPLOSION_TICKS = 5  # ticks a blast area is kept as dangerous after the bomb went off
+
+BLAST_POWER = 2
+
+SOFT_BLOCK_HP = 1
+ORE_BLOCK_HP = 3
+
+FIRE_MARGIN = 1  # ticks either side of a detonation a blast tile is avoided, to absorb latency
+
+# rules of the engine mirrored by the forward model
+PLAYER_START_HP = 3
+PLAYER_START_AMMO = 3
+AMMO_PERISH_TTL = 5 * BOMB_DURATION
+FIRE_REWARD = 25
+SOFT_BLOCK_REWARD = 2
+ORE_BLOCK_REWARD = 10
+TREASURE_REWARD = 1
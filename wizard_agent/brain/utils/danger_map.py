@@ -0,0 +1,61 @@
+"""
+Union of every bomb blast on the map, with the number of ticks until each cell burns.
+"""
+import numpy as np
+
+from . import constants
+
+# time to detonation of cells no blast reaches
+NO_DANGER = np.iinfo(np.int32).max
+
+
+class DangerMap:
+    """
+    Ray-casts the blast of every bomb with its own power and keeps, per cell, whether any
+    blast reaches it and the fewest ticks until one does
+    """
+
+    def __init__(self, grid: object, bombs: list, powers: dict = None, timers: dict = None):
+        """
+        powers maps a bomb to its blast radius and timers maps a bomb to the ticks left
+        before it goes off. Bombs missing from either get the defaults
+        """
+        powers = powers or {}
+        timers = timers or {}
+        self.width = grid.width
+        self.height = grid.height
+        self.time_to_detonation = np.full((grid.height, grid.width), NO_DANGER, dtype=np.int32)
+
+        for bomb in bombs:
+            mask = grid.blast_mask(bomb, powers.get(bomb, constants.BLAST_POWER))
+            ticks_left = timers.get(bomb, constants.BOMB_DURATION)
+            np.minimum(self.time_to_detonation, np.where(mask, ticks_left, NO_DANGER), out=self.time_to_detonation)
+
+        self.dangerous = self.time_to_detonation != NO_DANGER
+        self._dangerous_cells = self.dangerous.ravel().tolist()
+        self._tiles = None
+
+    def is_dangerous(self, tile) -> bool:
+        """
+        Returns true if a blast will reach the tile
+        """
+        x, y = tile
+        return 0 <= x < self.width and 0 <= y < self.height and self._dangerous_cells[self.width * y + x]
+
+    def ticks_until_blast(self, tile):
+        """
+        Returns the ticks left before a blast reaches the tile, or None if none will
+        """
+        if not self.is_dangerous(tile):
+            return None
+        return int(self.time_to_detonation[tile[1], tile[0]])
+
+    @property
+    def tiles(self):
+        """
+        Returns the dangerous (x,y) tuples
+        """
+        if self._tiles is None:
+            ys, xs = np.nonzero(self.dangerous)
+            self._tiles = [(int(x), int(y)) for x, y in zip(xs, ys)]
+        return self._tiles
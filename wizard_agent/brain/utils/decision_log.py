@@ -0,0 +1,70 @@
+"""
+Buffered decision log, written as JSON lines off the agent's hot path.
+"""
+import atexit
+import collections
+import json
+import threading
+
+FIELDS = ('tick', 'strategy', 'actions', 'reward', 'latency_ms')
+
+
+class DecisionLog:
+    """
+    Keeps decision records in a fixed-size ring buffer and writes them out in batches from a
+    background thread, one JSON object per line. Recording only appends a tuple; formatting
+    and file access happen on the flush thread. When the buffer fills up faster than it is
+    flushed, the oldest records are overwritten and counted as dropped
+    """
+
+    def __init__(self, filename: str, capacity: int = 1024, flush_interval: float = 1.0):
+        self.filename = filename
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, tick, strategy, actions, reward, latency_ms):
+        if len(self._buffer) == self.capacity:
+            self.dropped += 1
+        self._buffer.append((tick, strategy, actions, reward, latency_ms))
+        if len(self._buffer) >= self.capacity // 2:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes out every buffered record
+        """
+        with self._lock:
+            records = []
+            while self._buffer:
+                records.append(self._buffer.popleft())
+            if not records:
+                return
+            with open(self.filename, 'a', newline='') as f:
+                for record in records:
+                    f.write(json.dumps(dict(zip(FIELDS, record)), separators=(',', ':')) + '\n')
+
+    def close(self):
+        """
+        Stops the flush thread and writes out what is left
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
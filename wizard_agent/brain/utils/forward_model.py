@@ -0,0 +1,294 @@
+"""
+Array-backed copy of the game rules, cheap enough to copy and step thousands of times for lookahead.
+"""
+from . import constants
+
+# block kinds
+EMPTY = 0
+STATIC = 1
+SOFT = 2
+ORE = 3
+
+BLOCK_REWARDS = {SOFT: constants.SOFT_BLOCK_REWARD, ORE: constants.ORE_BLOCK_REWARD}
+MOVES = {'u': (0, 1), 'd': (0, -1), 'l': (-1, 0), 'r': (1, 0)}
+BOMB_ACTIONS = ('p', 'b')
+BLAST_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # the order the engine spreads fire in
+NO_OWNER = -1
+
+
+class ForwardModel:
+    """
+    The rules of Game.tick over flat lists indexed by width * y + x. Blocks and their hit points
+    are lists over the whole map; bombs, ammo and treasure are kept by index since there are
+    only a few of each, and players are lists indexed by player id.
+
+    A step follows the engine's order: actions, then last tick's fire burning players, blocks
+    and bombs, then pickups, timers, and bombs out of time turning into next tick's fire. It
+    differs from the engine in two ways: actions are applied in the order given rather than a
+    random one, and ammo and treasure never respawn, since where they appear is random
+    """
+
+    __slots__ = ('width', 'height', 'tick_number', 'block', 'block_hp', 'bombs', 'fire', 'ammo', 'treasure',
+                 'player_pos', 'player_hp', 'player_ammo', 'player_power', 'player_reward')
+
+    def __init__(self, width, height, tick_number=0):
+        self.width = width
+        self.height = height
+        self.tick_number = tick_number
+        self.block = [EMPTY] * (width * height)
+        self.block_hp = [0] * (width * height)
+        self.bombs = {}  # index -> (ticks to live, power, owner)
+        self.fire = []  # (index, owner) of the fire that burns next tick
+        self.ammo = {}  # index -> ticks to live
+        self.treasure = set()
+        self.player_pos = []
+        self.player_hp = []
+        self.player_ammo = []
+        self.player_power = []
+        self.player_reward = []
+
+    def copy(self):
+        other = ForwardModel.__new__(ForwardModel)
+        other.width = self.width
+        other.height = self.height
+        other.tick_number = self.tick_number
+        other.block = self.block[:]
+        other.block_hp = self.block_hp[:]
+        other.bombs = self.bombs.copy()
+        other.fire = self.fire[:]
+        other.ammo = self.ammo.copy()
+        other.treasure = self.treasure.copy()
+        other.player_pos = self.player_pos[:]
+        other.player_hp = self.player_hp[:]
+        other.player_ammo = self.player_ammo[:]
+        other.player_power = self.player_power[:]
+        other.player_reward = self.player_reward[:]
+        return other
+
+    # Building
+
+    def index(self, tile):
+        return self.width * tile[1] + tile[0]
+
+    def tile(self, idx):
+        return idx % self.width, idx // self.width
+
+    def add_player(self, tile, hp=constants.PLAYER_START_HP, ammo=constants.PLAYER_START_AMMO,
+                   power=constants.BLAST_POWER, reward=0):
+        """
+        Adds a player and returns its id, players being numbered in the order they are added
+        """
+        self.player_pos.append(self.index(tile))
+        self.player_hp.append(hp)
+        self.player_ammo.append(ammo)
+        self.player_power.append(power)
+        self.player_reward.append(reward)
+        return len(self.player_pos) - 1
+
+    def add_block(self, tile, kind, hp=0):
+        idx = self.index(tile)
+        self.block[idx] = kind
+        self.block_hp[idx] = hp
+
+    def add_bomb(self, tile, ticks_to_live, power=constants.BLAST_POWER, owner=NO_OWNER):
+        self.bombs[self.index(tile)] = (ticks_to_live, power, owner)
+
+    def add_fire(self, tile, owner=NO_OWNER):
+        self.fire.append((self.index(tile), owner))
+
+    def add_ammo(self, tile, ticks_to_live=constants.AMMO_PERISH_TTL):
+        self.ammo[self.index(tile)] = ticks_to_live
+
+    def add_treasure(self, tile):
+        self.treasure.add(self.index(tile))
+
+    # Queries
+
+    def location(self, pid):
+        return self.tile(self.player_pos[pid])
+
+    def is_alive(self, pid):
+        return self.player_hp[pid] > 0
+
+    @property
+    def is_over(self):
+        return sum(hp > 0 for hp in self.player_hp) <= 1
+
+    # Rules
+
+    def step(self, actions):
+        """
+        Plays one tick. actions maps player ids to action strings, applied in the dict's order
+        """
+        block = self.block
+        block_hp = self.block_hp
+        bombs = self.bombs
+        hp = self.player_hp
+        reward = self.player_reward
+
+        for pid, action in actions.items():
+            if action and hp[pid] > 0:
+                if action in MOVES:
+                    self._move(pid, MOVES[action])
+                elif action in BOMB_ACTIONS:
+                    self._place_bomb(pid)
+
+        # the fire of last tick's blasts burns whoever stands in it, blocks and bombs
+        fire = self.fire
+        if fire:
+            alive = [pid for pid, player_hp in enumerate(hp) if player_hp > 0]
+            for pid in alive:
+                idx = self.player_pos[pid]
+                for fire_idx, owner in fire:
+                    if fire_idx == idx:
+                        hp[pid] -= 1
+                        if owner != pid and owner != NO_OWNER:
+                            reward[owner] += constants.FIRE_REWARD
+            for idx, owner in fire:
+                kind = block[idx]
+                if kind == SOFT or kind == ORE:
+                    block_hp[idx] -= 1
+                    # every hit on a broken block pays, as in the engine
+                    if block_hp[idx] <= 0 and owner != NO_OWNER:
+                        reward[owner] += BLOCK_REWARDS[kind]
+                if idx in bombs:
+                    _, power, bomb_owner = bombs[idx]
+                    bombs[idx] = (0, power, bomb_owner)
+
+        ammo = self.ammo
+        treasure = self.treasure
+        if ammo or treasure:
+            for pid, player_hp in enumerate(hp):
+                if player_hp > 0:
+                    idx = self.player_pos[pid]
+                    if idx in ammo:
+                        self.player_ammo[pid] += 1
+                        del ammo[idx]
+                    if idx in treasure:
+                        reward[pid] += constants.TREASURE_REWARD
+                        treasure.discard(idx)
+
+        for idx, ticks_to_live in list(ammo.items()):
+            if ticks_to_live > 1:
+                ammo[idx] = ticks_to_live - 1
+            else:
+                del ammo[idx]
+
+        # bombs out of time blow up into the fire of next tick. Broken blocks and spent bombs
+        # are only removed afterwards, so they still stop the blasts of this tick
+        self.fire = []
+        if bombs:
+            exploding = []
+            for idx, (ticks_to_live, power, owner) in bombs.items():
+                bombs[idx] = (ticks_to_live - 1, power, owner)
+                if ticks_to_live <= 1:
+                    exploding.append(idx)
+            for idx in exploding:
+                _, power, owner = bombs[idx]
+                self._explode(idx, power, owner)
+            for idx in exploding:
+                del bombs[idx]
+
+        for idx, _ in fire:
+            if block_hp[idx] <= 0 and (block[idx] == SOFT or block[idx] == ORE):
+                block[idx] = EMPTY
+
+        self.tick_number += 1
+
+    def _move(self, pid, delta):
+        x, y = self.tile(self.player_pos[pid])
+        x += delta[0]
+        y += delta[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        idx = self.width * y + x
+        # players, dead or alive, can't be walked through
+        if self.is_free(idx):
+            self.player_pos[pid] = idx
+
+    def _place_bomb(self, pid):
+        idx = self.player_pos[pid]
+        if self.player_ammo[pid] <= 0 or idx in self.bombs:
+            return
+        self.player_ammo[pid] -= 1
+        self.bombs[idx] = (constants.BOMB_DURATION, self.player_power[pid], pid)
+
+    def blast(self, idx, power):
+        """
+        Returns the indices a bomb on the index would set on fire now
+        """
+        width = self.width
+        height = self.height
+        block = self.block
+        bombs = self.bombs
+        x, y = idx % width, idx // width
+        tiles = [idx]
+        for dx, dy in BLAST_DIRECTIONS:
+            for i in range(1, power + 1):
+                fx = x + dx * i
+                fy = y + dy * i
+                if not (0 <= fx < width and 0 <= fy < height):
+                    break
+                f_idx = width * fy + fx
+                tiles.append(f_idx)
+                if block[f_idx] != EMPTY or f_idx in bombs:
+                    break  # blocks and bombs take the fire and stop it
+        return tiles
+
+    def is_free(self, idx):
+        """
+        Returns true if a player could step on the index
+        """
+        return self.block[idx] == EMPTY and idx not in self.bombs and idx not in self.player_pos
+
+    def _explode(self, idx, power, owner):
+        self.fire.extend((f_idx, owner) for f_idx in self.blast(idx, power))
+
+
+def from_world(world):
+    """
+    Returns a forward model of the state the world model points at. Block hit points, bomb
+    timers and powers come from the trackers; fire is rebuilt from the bombs that just went
+    off. Only our own ammo, power, hit points and reward are known, opponents are assumed to
+    have the starting values, and a bomb is assumed to belong to whoever stands on it
+    """
+    game_state = world.game_state
+    player_state = world.player_state
+    width, height = game_state.size
+    model = ForwardModel(width, height, game_state.tick_number)
+
+    # the tracker counts the hits of the fire that is about to burn, which the model applies itself
+    block_tracker = world.block_tracker
+    for tile in game_state.indestructible_blocks:
+        model.add_block(tile, STATIC)
+    for tile in game_state.soft_blocks:
+        model.add_block(tile, SOFT, block_tracker.hp_before_hits.get(tile) or block_tracker.hp_at(tile) or
+                        constants.SOFT_BLOCK_HP)
+    for tile in game_state.ore_blocks:
+        model.add_block(tile, ORE, block_tracker.hp_before_hits.get(tile) or block_tracker.hp_at(tile) or
+                        constants.ORE_BLOCK_HP)
+
+    # players are listed in id order
+    owners = {}
+    for pid, tile in enumerate(game_state.opponents()):
+        if pid == player_state.id:
+            model.add_player(tile, player_state.hp, player_state.ammo, player_state.power, player_state.reward)
+        else:
+            model.add_player(tile)
+        owners[tile] = pid
+
+    tracker = world.bomb_tracker
+    for bomb in game_state.bombs:
+        placed_tick = tracker.placed_ticks.get(bomb, game_state.tick_number)
+        ticks_to_live = placed_tick + constants.BOMB_DURATION - game_state.tick_number - 1
+        model.add_bomb(bomb, max(ticks_to_live, 1), tracker.powers.get(bomb, constants.BLAST_POWER),
+                       owners.get(bomb, NO_OWNER))
+    for blast_tiles in tracker.latest_blast_tiles():
+        for tile in blast_tiles:
+            model.add_fire(tile)
+
+    for tile in game_state.ammo:
+        model.add_ammo(tile)
+    for tile in game_state.treasure:
+        model.add_treasure(tile)
+    return model
@@ -0,0 +1,316 @@
+"""
+Structure of the open tiles of the map: components, cut points, dead ends and corridors.
+"""
+from collections import deque
+from typing import Optional, Tuple
+
+NONE = -1
+
+
+class GraphIndex:
+    """
+    Index over the graph of open tiles (no block or bomb on them, players don't count since
+    they move every tick), with tiles linked to their up/down/left/right neighbours. Everything
+    is kept in flat lists indexed by width * y + x, so every query is a lookup:
+
+        component      id of the connected component, with its size
+        articulation   tiles whose loss splits their component (Tarjan's algorithm)
+        depth          0 on the loops of the map (its 2-core), otherwise the steps to the loop a
+                       dead end hangs from. In a component without loops, steps to the tile
+                       peeled last plus one
+        mouth          first tile of the dead end a tile is in, with the size of the pocket
+                       behind it (the mouth included)
+        corridor       id of the run of tiles with exactly two open neighbours, with its length
+
+    Updates are incremental: only the components touching tiles that opened or closed since
+    the last update are indexed again, so a tick where nothing changed costs one comparison
+    of the open lists
+    """
+
+    def __init__(self):
+        self.width = None
+        self.height = None
+        self.open = None
+        self.neighbours = []
+        self.degree = []
+        self.component = []
+        self.component_sizes = {}
+        self.articulation = []
+        self.depth = []
+        self.mouth = []
+        self.pocket_sizes = {}  # mouth -> tiles in its pocket
+        self.corridor = []
+        self.corridor_lengths = {}
+        self._next_component = 0
+        self._next_corridor = 0
+
+    def update(self, open_cells, width, height):
+        """
+        Points the index at the open tiles of a new tick, a flat list of booleans. Returns the
+        number of tiles indexed again
+        """
+        if self.open is None or (width, height) != (self.width, self.height):
+            self._reset(width, height)
+            self.open = list(open_cells)
+            return self._index(set(range(width * height)))
+
+        changed = [idx for idx, (before, now) in enumerate(zip(self.open, open_cells)) if before != now]
+        if not changed:
+            return 0
+        self.open = list(open_cells)
+
+        # the components a changed tile was in or next to are the only ones that can split or merge
+        stale = set()
+        for idx in changed:
+            for cell in [idx] + self.neighbours[idx]:
+                if self.component[cell] != NONE:
+                    stale.add(self.component[cell])
+        cells = set(changed)
+        for idx in range(width * height):
+            if self.component[idx] in stale:
+                cells.add(idx)
+        return self._index(cells)
+
+    # Queries
+
+    def _idx(self, tile):
+        return self.width * tile[1] + tile[0]
+
+    def is_open(self, tile: Tuple) -> bool:
+        return self.open[self._idx(tile)]
+
+    def exits(self, tile: Tuple) -> int:
+        """
+        Returns the number of open neighbours of the tile
+        """
+        return self.degree[self._idx(tile)]
+
+    def component_size(self, tile: Tuple) -> int:
+        """
+        Returns the number of open tiles connected to the tile, itself included, 0 if it is closed
+        """
+        return self.component_sizes.get(self.component[self._idx(tile)], 0)
+
+    def is_articulation(self, tile: Tuple) -> bool:
+        """
+        Returns true if closing the tile (e.g. with a bomb) would split its component
+        """
+        return self.articulation[self._idx(tile)]
+
+    def dead_end_depth(self, tile: Tuple) -> int:
+        """
+        Returns how many steps into a dead end the tile is, 0 if it is on a loop or closed
+        """
+        return max(self.depth[self._idx(tile)], 0)
+
+    def pocket(self, tile: Tuple) -> Optional[Tuple[Tuple, int]]:
+        """
+        Returns the mouth of the dead end the tile is in and the number of tiles behind it
+        (the mouth included), or None if the tile isn't in a dead end hanging from a loop
+        """
+        mouth = self.mouth[self._idx(tile)]
+        if mouth == NONE:
+            return None
+        return (mouth % self.width, mouth // self.width), self.pocket_sizes[mouth]
+
+    def pocket_tiles(self, tile: Tuple) -> list:
+        """
+        Returns the tiles of the dead end the tile is in, the mouth included, or an empty list
+        """
+        mouth = self.mouth[self._idx(tile)]
+        if mouth == NONE:
+            return []
+        width = self.width
+        return [(idx % width, idx // width) for idx, pocket in enumerate(self.mouth) if pocket == mouth]
+
+    def corridor_length(self, tile: Tuple) -> int:
+        """
+        Returns the length of the corridor (run of tiles with two open neighbours) the tile is
+        in, 0 if it isn't in one
+        """
+        return self.corridor_lengths.get(self.corridor[self._idx(tile)], 0)
+
+    # Indexing
+
+    def _reset(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.neighbours = []
+        for idx in range(size):
+            x, y = idx % width, idx // width
+            neighbours = []
+            if y > 0:
+                neighbours.append(idx - width)
+            if y < height - 1:
+                neighbours.append(idx + width)
+            if x < width - 1:
+                neighbours.append(idx + 1)
+            if x > 0:
+                neighbours.append(idx - 1)
+            self.neighbours.append(neighbours)
+        self.degree = [0] * size
+        self.component = [NONE] * size
+        self.component_sizes = {}
+        self.articulation = [False] * size
+        self.depth = [NONE] * size
+        self.mouth = [NONE] * size
+        self.pocket_sizes = {}
+        self.corridor = [NONE] * size
+        self.corridor_lengths = {}
+
+    def _index(self, cells):
+        """
+        Indexes the cells again, which must be whole components of the new open tiles (closed
+        cells among them are cleared)
+        """
+        open_cells = self.open
+        neighbours = self.neighbours
+        component = self.component
+        corridor = self.corridor
+        for stale in {component[idx] for idx in cells}:
+            self.component_sizes.pop(stale, None)
+        for stale in {corridor[idx] for idx in cells}:
+            self.corridor_lengths.pop(stale, None)
+        for idx in cells:
+            self.pocket_sizes.pop(idx, None)
+            degree = 0
+            if open_cells[idx]:
+                for n_idx in neighbours[idx]:
+                    if open_cells[n_idx]:
+                        degree += 1
+            self.degree[idx] = degree
+            component[idx] = NONE
+            self.articulation[idx] = False
+            self.depth[idx] = NONE
+            self.mouth[idx] = NONE
+            corridor[idx] = NONE
+
+        for idx in cells:
+            if self.open[idx] and self.component[idx] == NONE:
+                members = self._label_component(idx)
+                self._find_articulations(idx)
+                self._peel(members)
+                self._find_corridors(members)
+        return len(cells)
+
+    def _label_component(self, start):
+        component = self._next_component
+        self._next_component += 1
+        self.component[start] = component
+        members = [start]
+        queue = deque([start])
+        while queue:
+            idx = queue.popleft()
+            for n_idx in self.neighbours[idx]:
+                if self.open[n_idx] and self.component[n_idx] == NONE:
+                    self.component[n_idx] = component
+                    members.append(n_idx)
+                    queue.append(n_idx)
+        self.component_sizes[component] = len(members)
+        return members
+
+    def _find_articulations(self, root):
+        """
+        Tarjan's algorithm, iterative: a tile is a cut point if some subtree of its search tree
+        has no back edge climbing above it. The root is one if it has more than one subtree
+        """
+        open_cells = self.open
+        neighbours = self.neighbours
+        articulation = self.articulation
+        discovery = [NONE] * len(open_cells)
+        low = [0] * len(open_cells)
+        discovery[root] = 0
+        visited = 1
+        root_children = 0
+        stack = [(root, NONE, iter(neighbours[root]))]
+        while stack:
+            idx, parent, remaining = stack[-1]
+            for n_idx in remaining:
+                if not open_cells[n_idx]:
+                    continue
+                if discovery[n_idx] == NONE:
+                    discovery[n_idx] = low[n_idx] = visited
+                    visited += 1
+                    stack.append((n_idx, idx, iter(neighbours[n_idx])))
+                    if idx == root:
+                        root_children += 1
+                    break
+                if n_idx != parent and discovery[n_idx] < low[idx]:
+                    low[idx] = discovery[n_idx]
+            else:
+                stack.pop()
+                if stack:
+                    parent_idx = stack[-1][0]
+                    if low[idx] < low[parent_idx]:
+                        low[parent_idx] = low[idx]
+                    if parent_idx != root and low[idx] >= discovery[parent_idx]:
+                        articulation[parent_idx] = True
+        self.articulation[root] = root_children > 1
+
+    def _peel(self, members):
+        """
+        Strips dead ends off the component, round by round, leaving its loops. Dead-end depths
+        are then the steps back out to the loops
+        """
+        neighbours = self.neighbours
+        degree = {idx: self.degree[idx] for idx in members}
+        peeled = set()
+        last_round = []
+        leaves = [idx for idx in members if degree[idx] <= 1]
+        while leaves:
+            peeled.update(leaves)
+            last_round = leaves
+            next_leaves = []
+            for idx in leaves:
+                for n_idx in neighbours[idx]:
+                    if n_idx in degree and n_idx not in peeled:
+                        degree[n_idx] -= 1
+                        if degree[n_idx] == 1:
+                            next_leaves.append(n_idx)
+            leaves = next_leaves
+
+        depth = self.depth
+        mouth = self.mouth
+        if len(peeled) < len(members):
+            frontier = [idx for idx in members if idx not in peeled]
+            for idx in frontier:
+                depth[idx] = 0
+        else:
+            # no loops, the whole component is a dead end: measure from its centre, the tiles
+            # peeled last
+            frontier = last_round
+            for idx in frontier:
+                depth[idx] = 1
+        has_loop = depth[frontier[0]] == 0
+        while frontier:
+            next_frontier = []
+            for idx in frontier:
+                for n_idx in neighbours[idx]:
+                    if n_idx in peeled and depth[n_idx] == NONE:
+                        depth[n_idx] = depth[idx] + 1
+                        if has_loop:
+                            # the first tile off a loop opens a pocket, the rest belong to it
+                            pocket = n_idx if depth[idx] == 0 else mouth[idx]
+                            mouth[n_idx] = pocket
+                            self.pocket_sizes[pocket] = self.pocket_sizes.get(pocket, 0) + 1
+                        next_frontier.append(n_idx)
+            frontier = next_frontier
+
+    def _find_corridors(self, members):
+        for start in members:
+            if self.degree[start] != 2 or self.corridor[start] != NONE:
+                continue
+            corridor = self._next_corridor
+            self._next_corridor += 1
+            self.corridor[start] = corridor
+            length = 1
+            queue = [start]
+            while queue:
+                idx = queue.pop()
+                for n_idx in self.neighbours[idx]:
+                    if self.open[n_idx] and self.degree[n_idx] == 2 and self.corridor[n_idx] == NONE:
+                        self.corridor[n_idx] = corridor
+                        length += 1
+                        queue.append(n_idx)
+            self.corridor_lengths[corridor] = length
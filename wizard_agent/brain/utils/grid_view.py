@@ -0,0 +1,131 @@
+"""
+Typed NumPy view of the game map, built once per game state.
+"""
+import numpy as np
+
+from . import constants
+
+# entity code stored per cell
+EMPTY = 0
+AMMO = 1
+TREASURE = 2
+PLAYER = 3
+BOMB = 4
+SOFT_BLOCK = 5
+ORE_BLOCK = 6
+INDESTRUCTIBLE_BLOCK = 7
+
+# (dx, dy) of the four blast / movement directions
+DIRECTIONS = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+
+
+def _to_array(tiles):
+    return np.array(tiles, dtype=np.intp).reshape(-1, 2)
+
+
+class GridView:
+    """
+    Arrays are shaped (height, width) and indexed [y, x], so that a flattened array is
+    indexed by width * y + x like the rest of the utils
+    """
+
+    def __init__(self, game_state: object, block_hp: dict = None):
+        self.width, self.height = game_state.size
+        shape = (self.height, self.width)
+
+        # stamp entities in the order the engine serialises its map, so later ones win
+        self.entities = np.zeros(shape, dtype=np.int8)
+        self._stamp(game_state.opponents(), PLAYER)
+        self._stamp(game_state.indestructible_blocks, INDESTRUCTIBLE_BLOCK)
+        self._stamp(game_state.soft_blocks, SOFT_BLOCK)
+        self._stamp(game_state.ore_blocks, ORE_BLOCK)
+        self._stamp(game_state.ammo, AMMO)
+        self._stamp(game_state.treasure, TREASURE)
+        self._stamp(game_state.bombs, BOMB)
+
+        self.walkable = self.entities <= TREASURE
+        self.walkable_cells = self.walkable.ravel().tolist()  # flat, for the pure python searches
+        self.blockers = self.entities >= SOFT_BLOCK
+        self.bomb_mask = self.entities == BOMB
+        self.bombs = _to_array(game_state.bombs)
+
+        # hit points of destructible blocks, from the tracked values where known
+        self.block_hp = np.zeros(shape, dtype=np.int8)
+        self.block_hp[self.entities == SOFT_BLOCK] = constants.SOFT_BLOCK_HP
+        self.block_hp[self.entities == ORE_BLOCK] = constants.ORE_BLOCK_HP
+        if block_hp:
+            for (x, y), hp in block_hp.items():
+                if self.blockers[y, x]:
+                    self.block_hp[y, x] = hp
+
+    def _stamp(self, tiles, code):
+        coords = _to_array(tiles)
+        self.entities[coords[:, 1], coords[:, 0]] = code
+
+    def in_bounds(self, tile) -> bool:
+        return 0 <= tile[0] < self.width and 0 <= tile[1] < self.height
+
+    def is_walkable(self, tile) -> bool:
+        return self.in_bounds(tile) and bool(self.walkable[tile[1], tile[0]])
+
+    def neighbour_counts(self, mask):
+        """
+        Returns the number of up/down/left/right neighbours of each cell set in the mask
+        """
+        padded = np.pad(mask, 1).astype(np.int8)
+        return padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+
+    def escape_counts(self):
+        """
+        Returns the number of walkable neighbours of every walkable cell, -1 for the rest
+        """
+        return np.where(self.walkable, self.neighbour_counts(self.walkable), -1)
+
+    def empty_near(self, tiles):
+        """
+        Returns the walkable neighbours of each tile as (x,y) tuples, one entry per
+        (tile, neighbour) pair, in tile order then up, down, right, left
+        """
+        coords = _to_array(tiles)
+        if not len(coords):
+            return []
+        neighbours = (coords[:, None, :] + np.array(DIRECTIONS)[None, :, :]).reshape(-1, 2)
+        xs = neighbours[:, 0]
+        ys = neighbours[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        keep = inside.copy()
+        keep[inside] = self.walkable[ys[inside], xs[inside]]
+        return [(int(x), int(y)) for x, y in neighbours[keep]]
+
+    def blast_mask(self, bomb, power=constants.BLAST_POWER):
+        """
+        Returns a boolean mask of the cells reached by the blast of a bomb. Each ray stops
+        at the first block or bomb, which still catches fire
+        """
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        x, y = bomb
+        mask[y, x] = True
+        stops = self.blockers | self.bomb_mask
+        rays = [
+            (slice(max(0, y - power), y), x, True),   # y decreasing
+            (slice(y + 1, y + power + 1), x, False),  # y increasing
+            (y, slice(x + 1, x + power + 1), False),  # x increasing
+            (y, slice(max(0, x - power), x), True),   # x decreasing
+        ]
+        for rows, cols, reverse in rays:
+            ray = stops[rows, cols]
+            if reverse:
+                ray = ray[::-1]
+            hits = np.flatnonzero(ray)
+            reach = hits[0] + 1 if len(hits) else len(ray)
+            cells = np.zeros(len(ray), dtype=bool)
+            cells[:reach] = True
+            mask[rows, cols] = cells[::-1] if reverse else cells
+        return mask
+
+    def tiles(self, mask):
+        """
+        Returns the (x,y) tuples of the cells set in the mask
+        """
+        ys, xs = np.nonzero(mask)
+        return [(int(x), int(y)) for x, y in zip(xs, ys)]
@@ -0,0 +1,209 @@
+"""
+Remembers where the opponent has been and forecasts where it is going.
+"""
+import collections
+
+import numpy as np
+
+from . import constants
+from . import util_functions as utils
+
+HISTORY_LENGTH = 32  # ticks of history kept
+# moves told apart by the change of position between ticks, placing a bomb counts as staying put
+MOVES = {
+    constants.ACTIONS["none"]: (0, 0),
+    constants.ACTIONS["up"]: (0, 1),
+    constants.ACTIONS["down"]: (0, -1),
+    constants.ACTIONS["left"]: (-1, 0),
+    constants.ACTIONS["right"]: (1, 0),
+}
+
+
+class OpponentTracker:
+    """
+    Keeps the last HISTORY_LENGTH ticks of the opponent in a ring buffer: its position, the
+    bomb it placed that tick if any, the ammo it is inferred to hold and its manhattan distance
+    to the nearest pickup. Ammo starts at the engine's starting value, drops with every bomb
+    that appears under the opponent and grows with every pickup that vanishes from its tile.
+    An update is a handful of set lookups, the forecast is only computed when asked for
+    """
+
+    def __init__(self):
+        self.tick_number = None
+        # (tick, position, bomb or None, ammo, distance to the nearest pickup or None)
+        self.history = collections.deque(maxlen=HISTORY_LENGTH)
+        self.ammo = constants.PLAYER_START_AMMO
+        self.bombs_placed = 0
+        self.previous_bombs = set()
+        self.previous_ammo = set()
+
+    def update(self, game_state, player_state):
+        """
+        Feeds the tracker the state of a new tick
+        """
+        if game_state.tick_number == self.tick_number:
+            return
+        self.tick_number = game_state.tick_number
+        bombs = set(game_state.bombs)
+        ammo = set(game_state.ammo)
+
+        opponents = game_state.opponents(player_state.id)
+        if opponents:
+            position = utils.get_opponent(player_state.location, opponents)
+            bomb = position if position in bombs and position not in self.previous_bombs else None
+            if bomb is not None:
+                self.bombs_placed += 1
+                self.ammo = max(self.ammo - 1, 0)
+            if position in self.previous_ammo and position not in ammo:
+                self.ammo += 1
+            pickup_distance = min((utils.manhattan_distance(position, tile) for tile in game_state.treasure + game_state.ammo),
+                                  default=None)
+            self.history.append((self.tick_number, position, bomb, self.ammo, pickup_distance))
+
+        self.previous_bombs = bombs
+        self.previous_ammo = ammo
+
+    @property
+    def position(self):
+        """
+        Returns the last seen position of the opponent, or None
+        """
+        return self.history[-1][1] if self.history else None
+
+    def move_frequencies(self):
+        """
+        Returns {previous move: {move: share}} over the history, the moves following each move.
+        Every move counts once more than seen, so moves never seen keep some weight
+        """
+        counts = {previous: dict.fromkeys(MOVES, 1) for previous in MOVES}
+        deltas = {delta: move for move, delta in MOVES.items()}
+        previous = None
+        history = list(self.history)
+        for (tick, position, *_), (next_tick, next_position, *_) in zip(history, history[1:]):
+            move = None
+            if next_tick - tick == 1:  # with missed ticks in between, the move is unknown
+                move = deltas.get((next_position[0] - position[0], next_position[1] - position[1]))
+            if previous is not None and move is not None:
+                counts[previous][move] += 1
+            previous = move
+        return {previous: {move: count / sum(moves.values()) for move, count in moves.items()}
+                for previous, moves in counts.items()}
+
+    def last_move(self):
+        """
+        Returns the move the opponent made into its current position, or None if unknown
+        """
+        if len(self.history) < 2:
+            return None
+        (tick, position, *_), (next_tick, next_position, *_) = self.history[-2], self.history[-1]
+        if next_tick - tick != 1:
+            return None
+        deltas = {delta: move for move, delta in MOVES.items()}
+        return deltas.get((next_position[0] - position[0], next_position[1] - position[1]))
+
+    def target_weight(self):
+        """
+        Returns how much the opponent heads for pickups, between 0 and 1: how much more often
+        than chance its moves in the history brought it closer to the nearest one
+        """
+        closer = 0
+        moves = 0
+        history = list(self.history)
+        for (tick, position, _, _, distance), (next_tick, next_position, _, _, next_distance) in zip(history,
+                                                                                                    history[1:]):
+            if next_tick - tick != 1 or position == next_position or distance is None or next_distance is None:
+                continue
+            moves += 1
+            closer += next_distance < distance
+        # a player moving at random gets closer about half the time
+        share = (closer + 1) / (moves + 2)
+        return max(2 * share - 1, 0.0)
+
+    def likely_target(self, game_state):
+        """
+        Returns the treasure or ammo the opponent has the shortest path to, or None
+        """
+        position = self.position
+        if position is None:
+            return None
+        field = utils.get_distance_field(position, game_state)
+        reachable = [tile for tile in game_state.treasure + game_state.ammo if field.reachable(tile)]
+        return min(reachable, key=field.dist, default=None)
+
+    def predict(self, steps, game_state):
+        """
+        Returns the probability of the opponent being on each tile after each of the next steps
+        ticks, as a list of (height, width) arrays. Every tick the opponent heads for its likely
+        target with its target weight and otherwise makes a move drawn from the moves it made
+        after its last one, so the forecast is kept per last move. Moves into walls, blocks,
+        bombs or us leave it where it is
+        """
+        position = self.position
+        if position is None:
+            return []
+        grid = utils.get_grid_view(game_state)
+        walkable = grid.walkable.copy()
+        walkable[position[1], position[0]] = True
+        height, width = walkable.shape
+
+        # arrays stacked per move, in MOVES order. The cells each move is blocked from, as 0/1
+        # so the masks multiply
+        moves = list(MOVES)
+        padded = np.pad(walkable, 1)
+        blocked = np.array([~padded[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx] for dx, dy in MOVES.values()],
+                           dtype=float)
+        moving = 1.0 - blocked
+        frequencies = self.move_frequencies()
+        transitions = np.array([[frequencies[previous][move] for move in moves] for previous in moves])
+
+        weight = self.target_weight()
+        toward = self._toward_target(walkable, game_state) if weight else {}
+        if toward:
+            # cells without a step towards the target (the target itself, or out of reach) stay put
+            guided = np.array([toward.get(move, np.zeros_like(walkable)) for move in moves], dtype=float)
+            guided[0] = 1.0 - guided[1:].sum(axis=0)
+        else:
+            weight = 0.0
+
+        # probability of being on each cell having made each last move. Without a known last
+        # move, the moves that follow staying put are used
+        layers = np.zeros((len(moves), height, width))
+        layers[moves.index(self.last_move() or constants.ACTIONS["none"]), position[1], position[0]] = 1.0
+        forecast = []
+        for _ in range(steps):
+            share = (1 - weight) * np.tensordot(transitions, layers, axes=([0], [0]))
+            if weight:
+                share += weight * guided * layers.sum(axis=0)
+            # moves land one cell over, in a buffer padded so no move needs clipping. Blocked
+            # moves leave the opponent where it is, as if it had stayed put
+            landed = np.zeros((len(moves), height + 2, width + 2))
+            for i, (dx, dy) in enumerate(MOVES.values()):
+                landed[i, 1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx] = share[i] * moving[i]
+            layers = landed[:, 1:height + 1, 1:width + 1]
+            layers[0] += (share * blocked).sum(axis=0)
+            forecast.append(layers.sum(axis=0))
+        return forecast
+
+    def _toward_target(self, walkable, game_state):
+        """
+        Returns {move: mask of the cells whose shortest step towards the likely target is the
+        move}, one move per cell, or an empty dict when there is no target
+        """
+        target = self.likely_target(game_state)
+        if target is None:
+            return {}
+        height, width = walkable.shape
+        field = utils.structures.DistanceField(target, (width, height), walkable.ravel().tolist())
+        distances = np.array(field.distances).reshape(height, width).astype(float)
+        distances[distances == -1] = np.inf
+        padded = np.pad(distances, 1, constant_values=np.inf)
+        toward = {}
+        taken = np.zeros(walkable.shape, dtype=bool)
+        for move, (dx, dy) in MOVES.items():
+            if move == constants.ACTIONS["none"]:
+                continue
+            neighbour = padded[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx]
+            mask = (neighbour == distances - 1) & np.isfinite(distances) & ~taken
+            toward[move] = mask
+            taken |= mask
+        return toward
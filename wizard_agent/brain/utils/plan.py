@@ -0,0 +1,75 @@
+"""
+Multi-step plans that are kept across ticks for as long as the assumptions they were made on hold.
+"""
+import collections
+
+from . import util_functions as utils
+
+COLLECTIBLES = ['a', 't']
+
+
+class Plan:
+    """
+    The actions of a strategy together with the tile the player should be on after each one.
+    A plan assumes that the player moves as planned, that a collectible it heads for is still
+    there, that the tiles on its route stay walkable and that no blast reaches the route while
+    the player is on it. Only the cells that changed since the last tick are re-checked, and
+    the route is only checked for danger again when bombs or blocks change
+    """
+
+    def __init__(self, strategy_name, actions, location, game_state, grid):
+        self.strategy_name = strategy_name
+        self.actions = collections.deque(actions)
+        self.tiles = collections.deque()
+        self.location = location  # where the player should be now
+
+        tile = location
+        for action in actions:
+            next_tile = utils.get_tile_from_move(tile, action)
+            if next_tile == location or grid.is_walkable(next_tile):
+                tile = next_tile
+            self.tiles.append(tile)
+
+        # a plan that doesn't bomb anything heads for whatever is on its last tile
+        self.target = None
+        self.target_entity = None
+        if self.tiles and utils.ACTIONS["bomb"] not in self.actions:
+            self.target = self.tiles[-1]
+            entity = game_state.entity_at(self.target)
+            if entity in COLLECTIBLES:
+                self.target_entity = entity
+
+    def __len__(self):
+        return len(self.actions)
+
+    def next_action(self):
+        self.location = self.tiles.popleft()
+        return self.actions.popleft()
+
+    def is_valid(self, world, location):
+        """
+        Returns true if none of the assumptions the rest of the plan depends on broke since
+        the last tick
+        """
+        if location != self.location:
+            return False  # the last move didn't happen as planned
+
+        changed = world.changed_tiles  # None when there is nothing to compare with
+        game_state = world.game_state
+        grid = world.grid
+
+        if self.target_entity is not None and (changed is None or self.target in changed):
+            if game_state.entity_at(self.target) != self.target_entity:
+                return False
+
+        for tile in self.tiles:
+            if (changed is None or tile in changed) and tile != location and not grid.is_walkable(tile):
+                return False
+
+        if changed is None or world.bomb_tracker.changed:
+            schedule = world.blast_schedule
+            for step, tile in enumerate(self.tiles, 1):
+                if schedule.is_burning(tile, step):
+                    return False
+
+        return True
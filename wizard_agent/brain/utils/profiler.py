@@ -0,0 +1,160 @@
+"""
+Opt-in wall-clock instrumentation of ticks, strategies and utility functions.
+"""
+import bisect
+import csv
+import json
+import time
+
+# upper bounds (ms) of the histogram buckets, the last bucket takes everything slower
+BUCKET_BOUNDS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100]
+
+# module functions are patched once per process, whichever profilers time them:
+# (module, name) -> (original function, profilers recording it)
+_module_patches = {}
+
+
+class Histogram:
+    """
+    Fixed-size latency histogram. Percentiles are estimated as the upper bound of the bucket
+    they fall in
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'mean_ms': self.total_ms / self.count if self.count else 0,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+            'buckets': self.counts,
+        }
+
+
+class Profiler:
+    """
+    Records the wall time of the callables it wraps into one histogram per name. Nothing is
+    wrapped unless the profiler is used, so an agent that doesn't profile pays nothing.
+    Utility functions are patched on their module, so they are timed for every caller in the
+    process. Profilers sharing a process (e.g. both agents of a self-play match) share the
+    patch: each call is recorded by all of them, and the original is put back when the last
+    one restores
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self._patched = []  # (module, name, original function)
+
+    def record(self, name, ms):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].add(ms)
+
+    def timed(self, name, function):
+        """
+        Returns a wrapper of the function that records its wall time under the name
+        """
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, 1000 * (time.perf_counter() - start))
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def instrument_strategies(self, strategies):
+        """
+        Times can_execute and execute of every strategy, keyed by strategy name
+        """
+        for name, strategy in strategies.items():
+            strategy.can_execute = self.timed(f'{name}.can_execute', strategy.can_execute)
+            strategy.execute = self.timed(f'{name}.execute', strategy.execute)
+
+    def instrument_module(self, module, names):
+        """
+        Times the named functions of a module until restore is called
+        """
+        for name in names:
+            key = (module, name)
+            if key not in _module_patches:
+                function = getattr(module, name)
+                profilers = []
+                _module_patches[key] = (function, profilers)
+                setattr(module, name, _timed_for(profilers, name, function))
+            if self not in _module_patches[key][1]:
+                _module_patches[key][1].append(self)
+                self._patched.append(key)
+
+    def restore(self):
+        """
+        Stops timing the module functions, putting the originals back once no profiler times them
+        """
+        for key in reversed(self._patched):
+            function, profilers = _module_patches[key]
+            profilers.remove(self)
+            if not profilers:
+                setattr(key[0], key[1], function)
+                del _module_patches[key]
+        self._patched = []
+
+    def summary(self):
+        return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def dump_json(self, filename):
+        with open(filename, 'w') as f:
+            json.dump({'bucket_bounds_ms': BUCKET_BOUNDS_MS, 'timings': self.summary(), 'counters': self.counters}, f,
+                      indent=2)
+
+    def dump_csv(self, filename):
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'count', 'total_ms', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms'] +
+                            [f'le_{bound}ms' for bound in BUCKET_BOUNDS_MS] + ['overflow'])
+            for name, row in self.summary().items():
+                writer.writerow([name, row['count'], round(row['total_ms'], 3), round(row['mean_ms'], 3),
+                                 row['p50_ms'], row['p99_ms'], round(row['max_ms'], 3)] + row['buckets'])
+
+
+def _timed_for(profilers, name, function):
+    """
+    Returns a wrapper of the function that records its wall time under the name in every
+    profiler of the list, which may change while it is installed
+    """
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            ms = 1000 * (time.perf_counter() - start)
+            for profiler in profilers:
+                profiler.record(name, ms)
+
+    wrapper.__wrapped__ = function
+    return wrapper
@@ -0,0 +1,131 @@
+"""
+Time-expanded search for paths that never stand on a cell while it burns.
+"""
+import numpy as np
+
+from . import constants
+
+# end of the burn window of bombs whose timer isn't known
+FOREVER = float('inf')
+
+
+class BlastSchedule:
+    """
+    Burn windows of every cell, in steps from now. A bomb with ticks_left t burns its blast
+    at step t; the window is widened by a margin to absorb a tick of latency. Bombs without
+    a known timer burn for the whole search
+    """
+
+    def __init__(self, grid: object, bombs: list = (), powers: dict = None, timers: dict = None,
+                 margin: int = constants.FIRE_MARGIN):
+        powers = powers or {}
+        timers = timers or {}
+        self.grid = grid
+        self.width = grid.width
+        self.margin = margin
+        self.windows = {}  # cell index -> [(first step, last step)]
+        self.last_burn = {}  # cell index -> last step the cell burns
+        self.horizon = 0  # last step any cell with a known timer burns
+        for bomb in bombs:
+            self.add_bomb(bomb, powers.get(bomb, constants.BLAST_POWER), timers.get(bomb))
+
+    def copy(self):
+        schedule = BlastSchedule(self.grid, margin=self.margin)
+        schedule.windows = {idx: list(windows) for idx, windows in self.windows.items()}
+        schedule.last_burn = dict(self.last_burn)
+        schedule.horizon = self.horizon
+        return schedule
+
+    def add_bomb(self, bomb, power=constants.BLAST_POWER, ticks_left=None):
+        self.add_blast(np.flatnonzero(self.grid.blast_mask(bomb, power)).tolist(), ticks_left)
+
+    def add_blast(self, cells, ticks_left=None):
+        """
+        Adds a blast over the given cell indices, burning at ticks_left
+        """
+        if ticks_left is None:
+            window = (0, FOREVER)
+        else:
+            window = (ticks_left - self.margin, ticks_left + self.margin)
+            self.horizon = max(self.horizon, window[1])
+        for idx in cells:
+            self.windows.setdefault(idx, []).append(window)
+            self.last_burn[idx] = max(self.last_burn.get(idx, -1), window[1])
+
+    def detonation_step(self, tile):
+        """
+        Returns the first step any blast reaches the tile, or None if none does
+        """
+        windows = self.windows.get(self.width * tile[1] + tile[0])
+        if not windows:
+            return None
+        return min(start for start, _ in windows) + self.margin
+
+    def is_burning(self, tile, step):
+        return self._is_burning(self.width * tile[1] + tile[0], step)
+
+    def _is_burning(self, idx, step):
+        for start, end in self.windows.get(idx, ()):
+            if start <= step <= end:
+                return True
+        return False
+
+
+def find_safe_path(schedule, location, start_step=0, placed_bomb=False):
+    """
+    Breadth first search over (tile, step) states from the location at start_step, moving or
+    waiting each step and never standing on a burning cell. Returns the tiles occupied at each
+    following step (a repeated tile is a wait) until one no blast will reach again, or None if
+    there is no such route within the schedule's horizon. With placed_bomb, a bomb was just
+    placed on the location: the route may wait on it but never step back onto it once it left
+    """
+    grid = schedule.grid
+    width = grid.width
+    height = grid.height
+    walkable = grid.walkable_cells
+    last_burn = schedule.last_burn
+
+    start = width * location[1] + location[0]
+    bomb = start if placed_bomb else None
+    frontier = [start]
+    parents = []  # one {cell: previous cell} per step
+    step = start_step
+
+    while step <= schedule.horizon + 1:
+        for idx in frontier:
+            if last_burn.get(idx, -1) < step:
+                # reconstruct the route by walking the parents back to the start
+                path = []
+                for layer in reversed(parents):
+                    path.append((idx % width, idx // width))
+                    idx = layer[idx]
+                return path[::-1]
+
+        step += 1
+        layer = {}
+        for idx in frontier:
+            x = idx % width
+            y = idx // width
+            candidates = [idx]
+            if y > 0:
+                candidates.append(idx - width)
+            if y < height - 1:
+                candidates.append(idx + width)
+            if x < width - 1:
+                candidates.append(idx + 1)
+            if x > 0:
+                candidates.append(idx - 1)
+            for n_idx in candidates:
+                if n_idx in layer or (n_idx != idx and not walkable[n_idx]):
+                    continue
+                if n_idx == bomb and idx != bomb:
+                    continue  # the engine won't let us back onto our bomb
+                if schedule._is_burning(n_idx, step):
+                    continue
+                layer[n_idx] = idx
+        if not layer:
+            return None
+        parents.append(layer)
+        frontier = list(layer)
+
+    return None
@@ -1,5 +1,15 @@
 from . import graph_node
+from . import distance_field
+from . import race_map
 
 
 def Node(position, parent):
     return graph_node.Node(position, parent)
+
+
+def DistanceField(origin, size, walkable, blocked_tiles=frozenset()):
+    return distance_field.DistanceField(origin, size, walkable, blocked_tiles)
+
+
+def RaceMap(our_field, their_field):
+    return race_map.RaceMap(our_field, their_field)
@@ -0,0 +1,86 @@
+from collections import deque
+from typing import List, Optional, Tuple
+
+
+class DistanceField:
+    """
+    Breadth first search from a single origin over the walkable tiles of the map.
+    Distances and parents of every tile are stored in flat lists indexed by width * y + x
+    """
+
+    def __init__(self, origin: Tuple, size: Tuple, walkable: List, blocked_tiles=frozenset()):
+        self.origin = origin
+        self.width = size[0]
+        self.height = size[1]
+        self.distances = [-1] * (self.width * self.height)
+        self.parents = [-1] * (self.width * self.height)
+        self._search(walkable, blocked_tiles)
+
+    def _search(self, walkable, blocked_tiles):
+        width = self.width
+        height = self.height
+        distances = self.distances
+        parents = self.parents
+
+        # the origin is where the player stands, so it is never checked for walkability
+        if not self._in_bounds(self.origin):
+            return
+        start = width * self.origin[1] + self.origin[0]
+        distances[start] = 0
+        queue = deque([start])
+
+        while queue:
+            idx = queue.popleft()
+            x = idx % width
+            y = idx // width
+            new_dist = distances[idx] + 1
+            neighbours = []
+            if y > 0:
+                neighbours.append(idx - width)
+            if y < height - 1:
+                neighbours.append(idx + width)
+            if x < width - 1:
+                neighbours.append(idx + 1)
+            if x > 0:
+                neighbours.append(idx - 1)
+
+            for n_idx in neighbours:
+                if distances[n_idx] != -1 or not walkable[n_idx]:
+                    continue  # skip if visited or not walkable
+                if blocked_tiles and (n_idx % width, n_idx // width) in blocked_tiles:
+                    continue  # skip if blast tile
+                distances[n_idx] = new_dist
+                parents[n_idx] = idx
+                queue.append(n_idx)
+
+    def _in_bounds(self, tile):
+        return 0 <= tile[0] < self.width and 0 <= tile[1] < self.height
+
+    def reachable(self, tile: Tuple) -> bool:
+        """
+        Returns true if there is a path from the origin to the tile
+        """
+        return self._in_bounds(tile) and self.distances[self.width * tile[1] + tile[0]] != -1
+
+    def dist(self, tile: Tuple) -> Optional[int]:
+        """
+        Returns the number of moves from the origin to the tile, or None if it can't be reached
+        """
+        if not self.reachable(tile):
+            return None
+        return self.distances[self.width * tile[1] + tile[0]]
+
+    def path_to(self, tile: Tuple) -> Optional[List]:
+        """
+        Returns the (x,y) tuples leading from the origin to the tile (origin excluded),
+        in the same format as get_shortest_path. Returns None if the tile can't be reached
+        """
+        if not self.reachable(tile):
+            return None
+        width = self.width
+        path = []
+        idx = width * tile[1] + tile[0]
+        while self.parents[idx] != -1:
+            path.append((idx % width, idx // width))
+            idx = self.parents[idx]
+        return path[::-1]
@@ -2,6 +2,8 @@ from typing import Tuple
 
 
 class Node:
+    __slots__ = ('position', 'parent', 'dist_to_start', 'dist_to_goal', 'total_cost')
+
     def __init__(self, position: Tuple, parent: Tuple):
         self.position = position
         self.parent = parent
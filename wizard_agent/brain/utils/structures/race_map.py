@@ -0,0 +1,49 @@
+from typing import Optional, Tuple
+
+
+class RaceMap:
+    """
+    Who gets to each tile first, from the breadth first distance fields of two players. Both
+    fronts move one tile per tick, so a distance is the tick a player arrives. Arrivals and
+    margins are stored in flat lists indexed by width * y + x
+    """
+
+    def __init__(self, our_field: object, their_field: object):
+        self.width = our_field.width
+        self.height = our_field.height
+        self.ours = our_field.distances
+        self.theirs = their_field.distances
+        # ticks we arrive ahead of the opponent. A player that can't reach a tile counts as
+        # arriving after width * height ticks, later than any path
+        never = self.width * self.height
+        self.margins = [(theirs if theirs != -1 else never) - (ours if ours != -1 else never)
+                        for ours, theirs in zip(self.ours, self.theirs)]
+
+    def _index(self, tile):
+        return self.width * tile[1] + tile[0]
+
+    def _in_bounds(self, tile):
+        return 0 <= tile[0] < self.width and 0 <= tile[1] < self.height
+
+    def arrivals(self, tile: Tuple) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns the ticks we and the opponent need to reach the tile, None where one can't
+        """
+        idx = self._index(tile)
+        ours = self.ours[idx]
+        theirs = self.theirs[idx]
+        return (ours if ours != -1 else None), (theirs if theirs != -1 else None)
+
+    def margin(self, tile: Tuple) -> int:
+        """
+        Returns how many ticks before the opponent we reach the tile, negative if they are first
+        """
+        return self.margins[self._index(tile)]
+
+    def is_opponent_closer(self, tile: Tuple) -> bool:
+        """
+        Returns true if the opponent reaches the tile strictly before us. Ties go to us
+        """
+        if tile is None or not self._in_bounds(tile):
+            return False
+        return self.margins[self._index(tile)] < 0
@@ -0,0 +1,69 @@
+"""
+Batched scoring of the candidate tiles a strategy could head for.
+"""
+from . import util_functions as utils
+
+
+class TargetScorer:
+    """
+    Scores every candidate tile in one pass. Candidates may be listed more than once (e.g. a
+    tile next to two blocks) and every feature counts once per listing. Distances come from the
+    cached distance field of the player and the race against the opponent from the race map, so
+    scoring and picking the best tile cost no search per candidate, and the other features are
+    set lookups
+    """
+
+    def __init__(self, location, tiles, game_state, reachable_priority=1):
+        counts = {}
+        for tile in tiles:
+            counts[tile] = counts.get(tile, 0) + 1
+        self.candidates = list(counts)  # unique tiles, in the order they were first listed
+        self.counts = list(counts.values())
+
+        field = utils.get_distance_field(location, game_state)
+        width = game_state.size[0]
+        distances = field.distances
+        self.distances = [distances[width * y + x] for x, y in self.candidates]
+        self.scores = [reachable_priority if dist != -1 else -reachable_priority for dist in self.distances]
+
+    def add_membership(self, tiles, priority):
+        """
+        Adds the priority to the candidates found in the tiles
+        """
+        members = set(tiles)
+        scores = self.scores
+        for i, tile in enumerate(self.candidates):
+            if tile in members:
+                scores[i] += priority
+
+    def add_proximity(self, targets, radius, priority):
+        """
+        Adds the priority to the candidates within the manhattan radius of any target
+        """
+        near = set()
+        for x, y in targets:
+            for dx in range(-radius, radius + 1):
+                span = radius - abs(dx)
+                for dy in range(-span, span + 1):
+                    near.add((x + dx, y + dy))
+        self.add_membership(near, priority)
+
+    def ranked(self):
+        """
+        Returns the candidates from the best score down, ties in listing order
+        """
+        scores = self.scores
+        counts = self.counts
+        order = sorted(range(len(self.candidates)), key=lambda i: -scores[i] * counts[i])
+        return [self.candidates[i] for i in order]
+
+    def best(self, race_map):
+        """
+        Returns the best ranked tile we have a path to (other than where we stand) and that the
+        opponent doesn't reach first, or None
+        """
+        distances = dict(zip(self.candidates, self.distances))
+        for tile in self.ranked():
+            if distances[tile] > 0 and not race_map.is_opponent_closer(tile):
+                return tile
+        return None
@@ -1,11 +1,20 @@
+import heapq
 from typing import List
 
 from . import constants
+from . import grid_view
+from . import safe_path
 from . import structures
 
 ACTIONS = constants.ACTIONS
 Node = structures.Node
 
+# (game_state, GridView) of the last grid built by get_grid_view
+_grid_view_cache = (None, None)
+# (game_state, {(origin, blocked_tiles): DistanceField}) of the fields built by get_distance_field
+_distance_field_cache = (None, {})
+
+
 def manhattan_distance(start, end):
     """
     returns the manhattan distance between two tiles, calculated as:
@@ -100,65 +109,80 @@ def move_to_tile(location, tile):
 def get_shortest_path(start, end, game_state, blast_tiles = []):
     """
     Finds the shortest path from the start node to the end node.
-    Returns an array of (x,y) tuples. Uses A* search algorithm
+    Returns an array of (x,y) tuples. Uses A* search algorithm backed by a binary heap, with
+    parents and costs kept in flat lists indexed by width * y + x
     """
     if start is None or end is None:
         return None
 
-    # create a list for all nodes to visit and have been visited
-    queue = []
-    visited = []
-
-    # create a start node and end node
-    start_node = Node(start, None)
-    goal_node = Node(end, None)
-
-    queue.append(start_node)
-
-    while len(queue) > 0:
-        # sort the open list to get the node with the lowest cost first
-        queue.sort()
-
-        # get the node with the lowest cost
-        current_node = queue.pop(0)
-
-        # add the current node to the closed list
-        visited.append(current_node)
+    width, height = game_state.size
+    if not (0 <= start[0] < width and 0 <= start[1] < height and 0 <= end[0] < width and 0 <= end[1] < height):
+        return None  # a flat index off the map would wrap onto another tile
+    walkable = get_walkable_grid(game_state)
+    blocked = {width * y + x for x, y in blast_tiles if 0 <= x < width and 0 <= y < height}
+    start_idx = width * start[1] + start[0]
+    end_idx = width * end[1] + end[0]
+    end_x, end_y = end
+
+    # open list is a heap of (total cost, index), closed list is a flag per index
+    parent = [-1] * (width * height)
+    dist_to_start = [-1] * (width * height)
+    closed = [False] * (width * height)
+    dist_to_start[start_idx] = 0
+    queue = [(manhattan_distance(start, end), start_idx)]
+
+    while queue:
+        # get the tile with the lowest cost
+        _, idx = heapq.heappop(queue)
+        if closed[idx]:
+            continue  # stale entry, a cheaper one was already expanded
+        closed[idx] = True
 
         # check if we have reached the goal, return the path
-        if current_node == goal_node:
+        if idx == end_idx:
             path = []
-            while current_node != start_node:
-                path.append(current_node.position)
-                current_node = current_node.parent
+            while idx != start_idx:
+                path.append((idx % width, idx // width))
+                idx = parent[idx]
             # return reversed
             return path[::-1]
 
-        # loop through each neighbour
-        neighbours = get_surrounding_tiles(current_node.position, game_state)
+        # loop through each neighbour: up, down, right, left
+        x, y = idx % width, idx // width
+        new_dist = dist_to_start[idx] + 1
+        for nx, ny in ((x, y - 1), (x, y + 1), (x + 1, y), (x - 1, y)):
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            n_idx = width * ny + nx
+            if closed[n_idx] or n_idx in blocked or not walkable[n_idx]:
+                continue  # skip if visited, blast tile or not walkable
 
-        for tile in neighbours:
-            if tile in blast_tiles:
-                continue  # skip if blast tile
+            if 0 <= dist_to_start[n_idx] <= new_dist:
+                continue  # skip if already queued with a lower cost
 
-            if not is_walkable(tile, game_state):
-                continue  # skip if not walkable
+            dist_to_start[n_idx] = new_dist
+            parent[n_idx] = idx
+            heapq.heappush(queue, (new_dist + abs(nx - end_x) + abs(ny - end_y), n_idx))
 
-            neighbour = Node(tile, current_node)
+    return None  # no path found
 
-            if neighbour in visited:
-                continue  # skip if visited
 
-            # generate heuristics
-            neighbour.dist_to_start = manhattan_distance(neighbour.position, start_node.position)
-            neighbour.dist_to_goal = manhattan_distance(neighbour.position, goal_node.position)
-            neighbour.total_cost = neighbour.dist_to_start + neighbour.dist_to_goal
+def get_grid_view(game_state):
+    """
+    Returns the NumPy view of the map. The view is built once per game state and reused
+    by every query on it
+    """
+    global _grid_view_cache
+    if _grid_view_cache[0] is not game_state:
+        _grid_view_cache = (game_state, grid_view.GridView(game_state))
+    return _grid_view_cache[1]
 
-            # check if neighbour is in the open list and if it has a lower total value
-            if can_enqueue(queue, neighbour):
-                queue.append(neighbour)
 
-    return None  # no path found
+def get_walkable_grid(game_state):
+    """
+    Returns a flat list (indexed by width * y + x) flagging the walkable tiles of the map
+    """
+    return get_grid_view(game_state).walkable_cells
 
 
 def is_walkable(tile, game_state):
@@ -169,17 +193,6 @@ def is_walkable(tile, game_state):
     return not game_state.is_occupied(tile) or game_state.entity_at(tile) in collectible
 
 
-def can_enqueue(queue, neighbour):
-    """
-    Helper function for the A* search algorithm. Checks if neighbour is in
-    the queue and if it has lower total value
-    """
-    for node in queue:
-        if neighbour == node and neighbour.total_cost >= node.total_cost:
-            return False
-    return True
-
-
 def get_path_action_seq(location: object, path: List) -> List:
     """
     Given a list of (x,y) tuples, returns the action sequence to follow the path.
@@ -212,29 +225,13 @@ def get_bombs_in_range(location, bombs):
     return bombs_in_range
 
 
-def get_blast_zone(bomb, game_state):
+def get_blast_zone(bomb, game_state, power=constants.BLAST_POWER):
     """
-    Retrieves the tiles affected by the bomb blast
+    Retrieves the tiles affected by the bomb blast. Each ray travels up to power tiles and
+    stops at the first block or bomb, which still catches fire
     """
-    block_tile = ["ib", "sb", "ob"]
-    blast_tiles = [bomb]
-    neighbours = get_surrounding_tiles(bomb, game_state)
-    for tile in neighbours:
-        blast_tiles.append(tile)
-        entity = game_state.entity_at(tile)
-        if entity not in block_tile:
-            x = tile[0]
-            y = tile[1]
-            blast_dir = move_to_tile(bomb, tile)
-            if blast_dir == ACTIONS["left"]:
-                blast_tiles.append((x - 1, y))
-            elif blast_dir == ACTIONS["right"]:
-                blast_tiles.append((x + 1, y))
-            elif blast_dir == ACTIONS["up"]:
-                blast_tiles.append((x, y + 1))
-            elif blast_dir == ACTIONS["down"]:
-                blast_tiles.append((x, y - 1))
-    return blast_tiles
+    view = get_grid_view(game_state)
+    return view.tiles(view.blast_mask(bomb, power))
 
 
 def get_nearest_tile(location, tiles):
@@ -251,11 +248,36 @@ def get_nearest_tile(location, tiles):
         return None
 
 
+def get_distance_field(origin, game_state, blocked_tiles=()):
+    """
+    Returns the breadth first distance field from the origin. Fields are cached per
+    (game state, origin, blocked tiles), so every query within a tick shares a single search
+    """
+    global _distance_field_cache
+    if _distance_field_cache[0] is not game_state:
+        _distance_field_cache = (game_state, {})
+
+    blocked_tiles = frozenset(blocked_tiles)
+    key = (origin, blocked_tiles)
+    fields = _distance_field_cache[1]
+    if key not in fields:
+        fields[key] = structures.DistanceField(origin, game_state.size, get_walkable_grid(game_state), blocked_tiles)
+    return fields[key]
+
+
+def get_race_map(location, opponent_location, game_state):
+    """
+    Returns the race map between us and the opponent, built on the cached distance fields of both
+    """
+    return structures.RaceMap(get_distance_field(location, game_state),
+                              get_distance_field(opponent_location, game_state))
+
+
 def get_reachable_tiles(location, tiles, game_state):
+    distance_field = get_distance_field(location, game_state)
     reachable_tiles = []
     for tile in tiles:
-        path = get_shortest_path(location, tile, game_state)
-        if path:
+        if distance_field.dist(tile):
             reachable_tiles.append(tile)
     return reachable_tiles
 
@@ -270,16 +292,16 @@ def get_surrounding_empty_tiles(location, game_state):
 
 
 def get_empty_locations(tiles, game_state):
-    empty_locations = []
-    for tile in tiles:
-        empty_tiles = get_surrounding_empty_tiles(tile, game_state)
-        empty_locations = empty_locations + empty_tiles
-    return empty_locations
+    """
+    Retrieves the walkable tiles around each tile, one entry per (tile, neighbour) pair
+    """
+    return get_grid_view(game_state).empty_near(tiles)
 
 
 def is_opponent_closer(location, opponent_location, block):
     """
-    Gets the opponent's distance from the treasure and compare's it to our own distance from the treasure
+    Gets the opponent's distance from the treasure and compare's it to our own distance from the treasure.
+    Distances are manhattan, ignoring walls; RaceMap.is_opponent_closer compares path lengths
     """
     if block is None:
         return False
@@ -298,15 +320,17 @@ def get_opponent(location, opponents):
     return opponents[0]
 
 
-def is_safe_path(location, target_location, bombs, game_state):
+def is_safe_path(location, target_location, bombs, game_state, schedule=None):
+    """
+    Returns true if the shortest path to the target never stands on a tile while it burns.
+    Without a schedule of bomb timers every blast tile counts as burning
+    """
     path = get_shortest_path(location, target_location, game_state)
-    all_blast = []
-    for bomb in bombs:
-        blast_tiles = get_blast_zone(bomb, game_state)
-        all_blast.append(blast_tiles)
+    if schedule is None:
+        schedule = get_blast_schedule(game_state, bombs)
     if path:
-        for coord in path:
-            if coord in all_blast:
+        for step, coord in enumerate(path, 1):
+            if schedule.is_burning(coord, step):
                 return False
     return True
 
@@ -316,50 +340,74 @@ def get_safe_tiles(danger_tiles, game_state):
     Retrieves all the safe walkable tiles outside of danger zone
     """
     safe_tiles = []
+    danger_set = set(danger_tiles)
     for tile in danger_tiles:
         empty_tiles = get_surrounding_empty_tiles(tile, game_state)
         for empty in empty_tiles:
-            if empty not in danger_tiles:
+            if empty not in danger_set:
                 safe_tiles.append(empty)
     return safe_tiles
 
 
+def get_blast_schedule(game_state, bombs, powers=None, timers=None):
+    """
+    Returns the steps at which each tile burns. Bombs missing from timers burn throughout
+    """
+    return safe_path.BlastSchedule(get_grid_view(game_state), bombs, powers, timers)
+
+
+def get_safe_path(location, game_state, schedule=None, start_step=0):
+    """
+    Returns the tiles to stand on, step by step, to get out of reach of every blast in the
+    schedule. Returns [] if the location is already out of reach and None if there is no way out
+    """
+    if schedule is None:
+        schedule = get_blast_schedule(game_state, game_state.bombs)
+    return safe_path.find_safe_path(schedule, location, start_step)
+
+
+def get_bomb_step(path):
+    """
+    Returns the step a bomb is placed at after following the path from get_shortest_path
+    """
+    return max(len(path or []), 1) + 1
+
+
+def get_bomb_escape_path(location, game_state, schedule=None, start_step=1, power=constants.BLAST_POWER):
+    """
+    Returns the tiles to stand on, step by step, to get away from a bomb placed on the location
+    at start_step without being caught by it or by the bombs in the schedule. A repeated tile
+    is a wait. Returns None if there is no way out
+    """
+    if schedule is None:
+        schedule = get_blast_schedule(game_state, game_state.bombs)
+    schedule = schedule.copy()
+    ticks_left = start_step + constants.BOMB_DURATION
+    detonation_step = schedule.detonation_step(location)
+    if detonation_step is not None:
+        # a blast reaching the tile sets the new bomb off one tick later
+        ticks_left = min(ticks_left, detonation_step + 1)
+    schedule.add_bomb(location, power, ticks_left)
+    return safe_path.find_safe_path(schedule, location, start_step, placed_bomb=True)
+
+
 def safe_escape(location, game_state):
-    all_safe_walkable_tiles = []
-    bombs = game_state.bombs
-    blast_area = []
-    for bomb in bombs:
-        blast_zone = get_blast_zone(bomb, game_state)
-        blast_area = blast_area + blast_zone
-    blast_area = blast_area + get_blast_zone(location, game_state)  # putting the bomb on the bot's current location
-    for row in range(0, 12):
-        for col in range(0, 10):
-            tile = tuple([row, col])
-            if tile not in blast_area:
-                if is_walkable(tile, game_state):
-                    path = get_shortest_path(location, tile, game_state)
-                    if path:
-                        all_safe_walkable_tiles.append(tile)
-
-    nearest_tile = get_nearest_tile(location, all_safe_walkable_tiles)
-    return nearest_tile
+    """
+    Returns the nearest tile, in steps, that is out of reach of a bomb placed on the location
+    and of the bombs on the map
+    """
+    escape_path = get_bomb_escape_path(location, game_state)
+    if escape_path:
+        return escape_path[-1]
+    return None
 
 
 def get_escape_matrix(game_state):
-    size = game_state.size
-    width = size[0]
-    height = size[1]
-    escape_paths = [0] * (width * height)
-    for y in range(height):
-        for x in range(width):
-            tile = (x, y)
-            idx = width * y + x
-            if is_walkable(tile, game_state):
-                empty_tiles = get_surrounding_empty_tiles(tile, game_state)
-                escape_paths[idx] = len(empty_tiles)
-            else:
-                escape_paths[idx] = -1
-    return escape_paths
+    """
+    Returns the number of walkable neighbours of each tile as a flat list indexed by
+    width * y + x, -1 for tiles that aren't walkable
+    """
+    return get_grid_view(game_state).escape_counts().ravel().tolist()
 
 
 def get_matrix_val_for_tile(tile, matrix, map_width):
@@ -0,0 +1,207 @@
+"""
+Per-tick cache of the views derived from the game state, shared by all strategies.
+"""
+from . import block_tracker
+from . import bomb_tracker
+from . import constants
+from . import danger_map
+from . import graph_index
+from . import opponent_tracker
+from . import util_functions as utils
+
+
+class WorldModel:
+    """
+    Computes each derived view of the game state lazily, once per tick, and hands the same
+    result to every strategy that asks for it. The cache is dropped whenever the tick number changes.
+    Hit/miss counters are kept per view to show how much recomputation was saved
+    """
+
+    def __init__(self):
+        self.game_state = None
+        self.player_state = None
+        self.tick_number = None
+        self._cache = {}
+        self.hits = {}
+        self.misses = {}
+        # persists across ticks
+        self.bomb_tracker = bomb_tracker.BombTracker()
+        self.block_tracker = block_tracker.BlockTracker()
+        self.opponent_tracker = opponent_tracker.OpponentTracker()
+        self._graph_index = graph_index.GraphIndex()  # updated in place on the ticks it is asked for
+        self.previous_grid = None  # grid of the last tick it was built on
+
+    def update(self, game_state, player_state):
+        """
+        Points the model at the current state, invalidating the cache on a new tick
+        """
+        is_new_tick = game_state.tick_number != self.tick_number or game_state is not self.game_state
+        self.game_state = game_state
+        self.player_state = player_state
+        if is_new_tick:
+            self.tick_number = game_state.tick_number
+            self.previous_grid = self._cache.get(('grid', None), self.previous_grid)
+            self._cache = {}
+            self.bomb_tracker.update(game_state, player_state)
+            self.block_tracker.update(game_state, self.bomb_tracker.latest_blast_tiles())
+            self.opponent_tracker.update(game_state, player_state)
+        return self
+
+    def get_stats(self):
+        """
+        Returns the hit and miss counts of every view
+        """
+        views = set(self.hits) | set(self.misses)
+        return {view: {'hits': self.hits.get(view, 0), 'misses': self.misses.get(view, 0)} for view in views}
+
+    def _get(self, view, key, compute, *args):
+        cache_key = (view, key)
+        if cache_key in self._cache:
+            self.hits[view] = self.hits.get(view, 0) + 1
+            return self._cache[cache_key]
+        self.misses[view] = self.misses.get(view, 0) + 1
+        value = compute(*args)
+        self._cache[cache_key] = value
+        return value
+
+    # Views
+
+    @property
+    def soft_blocks(self):
+        return self._get('soft_blocks', None, lambda: self.game_state.soft_blocks)
+
+    @property
+    def ore_blocks(self):
+        return self._get('ore_blocks', None, lambda: self.game_state.ore_blocks)
+
+    @property
+    def opponent(self):
+        return self._get('opponent', None, self._find_opponent)
+
+    @property
+    def race_map(self):
+        """
+        Ticks we and the opponent need to reach every tile, and who gets there first
+        """
+        return self._get('race_map', None, utils.get_race_map, self.player_state.location, self.opponent,
+                         self.game_state)
+
+    def opponent_forecast(self, steps):
+        """
+        Probability of the opponent being on each tile after each of the next steps ticks
+        """
+        return self._get('opponent_forecast', steps, self.opponent_tracker.predict, steps, self.game_state)
+
+    @property
+    def grid(self):
+        return self._get('grid', None, utils.get_grid_view, self.game_state)
+
+    @property
+    def graph_index(self):
+        """
+        Components, cut points, dead ends and corridors of the tiles free of blocks and bombs
+        """
+        return self._get('graph_index', None, self._update_graph_index)
+
+    @property
+    def changed_tiles(self):
+        """
+        Tiles whose entity changed since the grid was last built, or None if it never was
+        """
+        return self._get('changed_tiles', None, self._diff_grids)
+
+    @property
+    def escape_matrix(self):
+        return self._get('escape_matrix', None, utils.get_escape_matrix, self.game_state)
+
+    @property
+    def danger_map(self):
+        """
+        Blast zones of every bomb on the map, with the ticks left until each cell burns
+        """
+        return self._get('danger_map', None, self._build_danger_map)
+
+    def is_dangerous(self, tile):
+        return self.danger_map.is_dangerous(tile)
+
+    def blast_zone(self, bomb):
+        power = self.bomb_tracker.powers.get(bomb, constants.BLAST_POWER)
+        return self._get('blast_zone', bomb, utils.get_blast_zone, bomb, self.game_state, power)
+
+    def danger_zone(self, bombs):
+        """
+        Returns the unique tiles covered by the blasts of the given bombs
+        """
+        return self._get('danger_zone', tuple(bombs), self._union_blast_zones, bombs)
+
+    def shortest_path(self, start, end):
+        return self._get('shortest_path', (start, end), utils.get_shortest_path, start, end, self.game_state)
+
+    @property
+    def blast_schedule(self):
+        """
+        Steps at which each tile burns, from the tracked bomb timers
+        """
+        return self._get('blast_schedule', None, self._build_blast_schedule)
+
+    def is_safe_path(self, location, target_location):
+        return self._get('is_safe_path', (location, target_location), utils.is_safe_path, location,
+                         target_location, self.game_state.bombs, self.game_state, self.blast_schedule)
+
+    def safe_path(self, location, start_step):
+        """
+        Returns the route out of reach of every blast from the location at start_step, or None
+        """
+        return self._get('safe_path', (location, start_step), utils.get_safe_path, location, self.game_state,
+                         self.blast_schedule, start_step)
+
+    def bomb_escape_path(self, location, start_step):
+        """
+        Returns the route away from a bomb of ours placed on the location at start_step, or None
+        """
+        return self._get('bomb_escape_path', (location, start_step), utils.get_bomb_escape_path, location,
+                         self.game_state, self.blast_schedule, start_step, self.player_state.power)
+
+    def surrounding_empty_tiles(self, location):
+        return self._get('surrounding_empty_tiles', location, utils.get_surrounding_empty_tiles, location,
+                         self.game_state)
+
+    def empty_near_blocks(self, blocks):
+        """
+        Returns the walkable tiles next to each block, one entry per (block, tile) pair
+        """
+        return self._get('empty_near_blocks', tuple(blocks), utils.get_empty_locations, blocks, self.game_state)
+
+    # Helpers
+
+    def _find_opponent(self):
+        location = self.player_state.location
+        opponent_list = self.game_state.opponents(self.player_state.id)
+        return utils.get_opponent(location, opponent_list)
+
+    def _union_blast_zones(self, bombs):
+        return danger_map.DangerMap(self.grid, bombs, self.bomb_tracker.powers).tiles
+
+    def _update_graph_index(self):
+        grid = self.grid
+        open_cells = ~(grid.blockers | grid.bomb_mask)
+        self._graph_index.update(open_cells.ravel().tolist(), grid.width, grid.height)
+        return self._graph_index
+
+    def _diff_grids(self):
+        if self.previous_grid is None:
+            return None
+        return set(self.grid.tiles(self.grid.entities != self.previous_grid.entities))
+
+    def _build_blast_schedule(self):
+        tracker = self.bomb_tracker
+        schedule = utils.get_blast_schedule(self.game_state, self.game_state.bombs, tracker.powers, tracker.timers())
+        # bombs that left the map this tick still burn during the next one
+        width = self.game_state.size[0]
+        for tiles in tracker.latest_blast_tiles():
+            schedule.add_blast([width * y + x for x, y in tiles], 1)
+        return schedule
+
+    def _build_danger_map(self):
+        tracker = self.bomb_tracker
+        return danger_map.DangerMap(self.grid, self.game_state.bombs, tracker.powers, tracker.timers())
@@ -19,14 +19,37 @@ Ours sure will be exciting to watch. Look forward to it. This is the best we can
 # import numpy as np
 # import pandas as pd
 # import sklearn
+import os
+import time
 from . import brain
 from datetime import datetime
 
 utils = brain.utils.util_functions
+ACTIONS = brain.utils.constants.ACTIONS
+
+# utility functions timed when profiling
+PROFILED_UTILS = ['get_shortest_path', 'safe_escape', 'get_blast_zone', 'get_bomb_escape_path', 'is_safe_path',
+                  'get_distance_field']
+
+# seconds of planning per tick before playing the fallback action, half of the engine tick
+TICK_DEADLINE = 0.05
+
+
+def get_tick_deadline(default):
+    """
+    Returns the tick deadline set by the WIZARD_TICK_DEADLINE environment variable, in seconds,
+    None when it is 'none' or 0, or the default when it isn't set
+    """
+    value = os.environ.get('WIZARD_TICK_DEADLINE')
+    if value is None:
+        return default
+    if value.strip().lower() in ('', 'none', '0'):
+        return None
+    return float(value)
 
 
 class Agent:
-    def __init__(self):
+    def __init__(self, tick_deadline=TICK_DEADLINE):
         self.strategies = {
             'random': brain.RandomStrategy(),
             'flee': brain.FleeStrategy(),
@@ -38,79 +61,178 @@ class Agent:
             'retreat': brain.RetreatStrategy(),
             'smartbomb': brain.SmartBombStrategy(),
             'smartcollect': brain.SmartCollectionStrategy(),
+            'mcts': brain.MctsStrategy(),
+            'trap': brain.TrapStrategy(),
+            'chainbomb': brain.ChainBombStrategy(),
         }
-        self.action_queue = []
+        self.plan = None
+
+        # share one per-tick world model between all strategies
+        self.world = brain.WorldModel()
+        for strategy in self.strategies.values():
+            strategy.bind_world(self.world)
 
         self.end_tick = 1800
         self.step = 0
 
         self.initial_destroyable_blocks = 0
 
+        # ANYTIME MODE, give up on planning past the deadline and play the fallback action. A
+        # wall-clock deadline makes decisions depend on machine load, so offline drivers turn it
+        # off with tick_deadline=None (or WIZARD_TICK_DEADLINE=none) to replay seeded matches
+        self.tick_deadline = get_tick_deadline(tick_deadline)
+        self.anytime_mode = self.tick_deadline is not None
+        self.fallback_action = ACTIONS["none"]
+        # strategy found to execute when the deadline passed before its plan was made, planned
+        # first on the next tick
+        self.deferred_strategy = None
+        self.tier_counts = {'queued': 0, 'planned': 0, 'replanned': 0, 'deadline': 0, 'deferred': 0, 'vetoed': 0}
+
+        # SEARCH MODE, play the tree search instead of the hand-written strategies, enabled with
+        # the WIZARD_SEARCH environment variable
+        self.search_mode = bool(os.environ.get('WIZARD_SEARCH'))
+
         # DEBUG
         self.debug_mode = False
-        self.filename = datetime.now().strftime('wizard_agent/log/log_%H_%M_%d_%m_%Y.txt')
-
-    def save_action_log(self, step, actions, player_state, strategy_name):
-        reward = player_state.reward
-        with open(self.filename, 'a+', newline='') as f:
-            f.write('Agent ' + str(
-                player_state.id) + ' | Tick: {0} - {1} | Current Score: {2} | Strategy Used: {3} \n'.format(step,
-                                                                                                            actions,
-                                                                                                            reward,
-                                                                                                            strategy_name))
+        self.filename = datetime.now().strftime('wizard_agent/log/log_%H_%M_%d_%m_%Y.jsonl')
+        self.action_log = None
+
+        # PROFILING, enabled with the WIZARD_PROFILE environment variable
+        self.profile_mode = bool(os.environ.get('WIZARD_PROFILE'))
+        self.profiler = None
+        if self.profile_mode:
+            self.profiler = brain.utils.profiler.Profiler()
+            self.profiler.instrument_strategies(self.strategies)
+            self.profiler.instrument_module(utils, PROFILED_UTILS)
+            self.next_move = self.profiler.timed('tick', self.next_move)
+            self.profile_filename = datetime.now().strftime('wizard_agent/log/profile_%H_%M_%d_%m_%Y')
+
+    def on_game_over(self, game_state, player_state):
+        if self.action_log:
+            self.action_log.close()
+        if self.profile_mode:
+            self.profiler.restore()
+            self.profiler.counters.update(self.tier_counts)
+            # agents sharing a process or a minute each get their own files
+            filename = f'{self.profile_filename}_p{player_state.id}_{os.getpid()}'
+            self.profiler.dump_json(filename + '.json')
+            self.profiler.dump_csv(filename + '.csv')
 
     def next_move(self, game_state, player_state):
         """This method is called each time your Agent is required to choose an action"""
-        # if queue is empty, get strategy
-        if not self.action_queue:
-            strategy_name = "retreat"
-            can_do_flee = self.strategies["flee"].can_execute(game_state, player_state)
-            can_do_bomb = self.strategies["smartbomb"].can_execute(game_state, player_state)
-            can_do_kill = self.strategies["kill"].can_execute(game_state, player_state)
-            can_do_combo = self.strategies["combo_kill"].can_execute(game_state, player_state)
-            can_do_collect = self.strategies["smartcollect"].can_execute(game_state, player_state)
-
-            # Check Destroyable Item
-
-            if self.step == 0:
-                self.initial_destroyable_blocks = len(game_state.soft_blocks) + len(game_state.ore_blocks)
-
-            cur_destroyable_items = len(game_state.soft_blocks) + len(game_state.ore_blocks)
-
-            if cur_destroyable_items > int(0.25 * self.initial_destroyable_blocks):
-                if can_do_flee:
-                    strategy_name = 'flee'
-                elif can_do_bomb:
-                    strategy_name = 'smartbomb'
-                elif can_do_collect:
-                    strategy_name = 'smartcollect'
-                elif can_do_combo:
-                    strategy_name = 'combo_kill'
-                elif can_do_kill:
-                    strategy_name = 'kill'
+        start = time.perf_counter()
+        deadline = start + self.tick_deadline if self.anytime_mode else None
+        world = self.world.update(game_state, player_state)
+        location = player_state.location
+
+        # drop the plan as soon as an assumption it was made on breaks
+        if self.plan and not self.plan.is_valid(world, location):
+            self.tier_counts['replanned'] += 1
+            self.plan = None
+
+        # if there is no plan, get strategy
+        if not self.plan:
+            if self.anytime_mode:
+                for strategy in self.strategies.values():
+                    strategy.set_deadline(deadline)
+            strategy_name = self.choose_strategy(game_state, player_state, world, deadline)
+
+            if strategy_name is not None and self.anytime_mode and time.perf_counter() > deadline:
+                # found in time but no time left to plan it, keep it for the next tick
+                self.tier_counts['deferred'] += 1
+                self.deferred_strategy = strategy_name
+                strategy_name = None
+
+            if strategy_name is None:
+                # out of time, play the safe action planned last tick
+                self.tier_counts['deadline'] += 1
+                strategy_name = 'fallback'
+                actions = [self.fallback_action]
             else:
-                if can_do_flee:
-                    strategy_name = 'flee'
-                elif can_do_combo:
-                    strategy_name = 'combo_kill'
-                elif can_do_kill:
-                    strategy_name = 'kill'
-                elif can_do_collect:
-                    strategy_name = 'smartcollect'
-                elif can_do_bomb:
-                    strategy_name = 'smartbomb'
-
-            # enqueue next action sequence
-            strategy = self.strategies[strategy_name]
-            actions = strategy.execute(game_state, player_state)
-
-            # log bot action
-            if self.debug_mode:
-                if self.step <= 1800:
-                    self.save_action_log(self.step, actions, player_state, strategy_name)
-                    self.step += 1
-
-            self.action_queue = self.action_queue + actions
+                self.tier_counts['planned'] += 1
+
+                # enqueue next action sequence
+                strategy = self.strategies[strategy_name]
+                actions = strategy.execute(game_state, player_state)
+
+                # log bot action
+                if self.debug_mode:
+                    if self.step <= 1800:
+                        if self.action_log is None:
+                            self.action_log = brain.utils.decision_log.DecisionLog(self.filename)
+                        latency_ms = 1000 * (time.perf_counter() - start)
+                        self.action_log.record(game_state.tick_number, strategy_name, actions, player_state.reward,
+                                               latency_ms)
+                        self.step += 1
+
+            self.plan = brain.utils.plan.Plan(strategy_name, actions or [ACTIONS["none"]], location, game_state,
+                                              world.grid)
+        else:
+            self.tier_counts['queued'] += 1
+
+        action = self.plan.next_action()
+
+        # never step into a blast when there is a way to stay clear of it
+        if not self.is_safe_action(world, location, action):
+            escape_path = world.safe_path(location, 0)
+            if escape_path is not None:
+                self.tier_counts['vetoed'] += 1
+                self.plan = None
+                action = utils.move_to_tile(location, escape_path[0]) if escape_path else ACTIONS["none"]
+
+        # plan the fallback of the next tick from where this action leads
+        self.fallback_action = self.get_fallback_action(world, location, action)
 
         # execute the first action
-        return self.action_queue.pop(0)
+        return action
+
+    def choose_strategy(self, game_state, player_state, world, deadline):
+        """
+        Returns the first strategy, in priority order, that can execute. Returns None if the
+        deadline passes before one is found. A strategy deferred last tick is tried right after
+        flee, since the ones above it couldn't execute then
+        """
+        # Check Destroyable Item
+
+        if self.step == 0:
+            self.initial_destroyable_blocks = len(world.soft_blocks) + len(world.ore_blocks)
+
+        cur_destroyable_items = len(world.soft_blocks) + len(world.ore_blocks)
+
+        if self.search_mode:
+            priority = ['flee', 'mcts']
+        elif cur_destroyable_items > int(0.25 * self.initial_destroyable_blocks):
+            priority = ['flee', 'trap', 'chainbomb', 'smartbomb', 'smartcollect', 'combo_kill', 'kill']
+        else:
+            priority = ['flee', 'trap', 'chainbomb', 'combo_kill', 'kill', 'smartcollect', 'smartbomb']
+
+        deferred, self.deferred_strategy = self.deferred_strategy, None
+        if deferred is not None and deferred != priority[0]:
+            priority = [priority[0], deferred] + [name for name in priority[1:] if name != deferred]
+
+        for strategy_name in priority:
+            if self.anytime_mode and time.perf_counter() > deadline:
+                return None
+            if self.strategies[strategy_name].can_execute(game_state, player_state):
+                return strategy_name
+        return "retreat"
+
+    def is_safe_action(self, world, location, action):
+        """
+        Returns true if the tile the action leads to doesn't burn next tick
+        """
+        return not world.blast_schedule.is_burning(self.get_next_tile(world, location, action), 1)
+
+    def get_fallback_action(self, world, location, action):
+        """
+        Returns the first move, one tick from now, of the quickest way out of every blast
+        """
+        next_tile = self.get_next_tile(world, location, action)
+        escape_path = world.safe_path(next_tile, 1)
+        if escape_path:
+            return utils.move_to_tile(next_tile, escape_path[0])
+        return ACTIONS["none"]
+
+    def get_next_tile(self, world, location, action):
+        tile = utils.get_tile_from_move(location, action)
+        return tile if world.grid.is_walkable(tile) else location